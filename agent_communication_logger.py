@@ -1,8 +1,29 @@
 import json
 import os
+import time
+import queue
+import atexit
+import threading
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Writer thread flushes whichever comes first: 50 ms of batching, 64 KB of text or 256 records
+FLUSH_INTERVAL_SEC = 0.05
+FLUSH_BYTES = 64 * 1024
+FLUSH_MAX_RECORDS = 256
+
+
+def _to_line(entry):
+    """One JSONL line (UTF-8 text, non-ASCII kept as-is)"""
+    if orjson:
+        return orjson.dumps(entry, default=str).decode("utf-8") + "\n"
+    return json.dumps(entry, ensure_ascii=False) + "\n"
+
 class AgentCommunicationLogger:
     def __init__(self):
         self.log_dir = Path("logs/agent_communications")
@@ -16,38 +37,99 @@ class AgentCommunicationLogger:
             "agent:main:subagent:9bd475bd-9f19-4bff-83b7-b1ee2ab962be": "DevOps",
             "agent:main:main": "Main System"
         }
+        # Callers only enqueue; one background thread owns the file
+        self._queue = queue.SimpleQueue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._summary = None  # Loaded by the writer thread on first flush, then kept in memory
+        atexit.register(self.close)
 
     def log_message(self, from_agent, to_agent, message, message_type="direct"):
+        now = datetime.now()
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "from": self.agent_names.get(from_agent, from_agent),
             "from_id": from_agent,
             "to": self.agent_names.get(to_agent, to_agent),
             "to_id": to_agent,
             "type": message_type,
             "message": message,
-            "vn_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "vn_time": now.strftime("%Y-%m-%d %H:%M:%S")
         }
         
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
-        
-        self._update_summary(log_entry)
+        self._ensure_writer()
+        self._queue.put(log_entry)
         return log_entry
 
-    def _update_summary(self, last_entry):
+    def _ensure_writer(self):
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop, name="agent-comm-writer", daemon=True
+                )
+                self._writer.start()
+
+    def _write_loop(self):
+        """Drain queued entries into the JSONL file in batched writes"""
+        with open(self.log_file, "a", encoding="utf-8", buffering=FLUSH_BYTES) as f:
+            stop = False
+            while not stop:
+                entry = self._queue.get()
+                if entry is None:
+                    break
+                batch = [entry]
+                lines = [_to_line(entry)]
+                size = len(lines[0])
+                deadline = time.monotonic() + FLUSH_INTERVAL_SEC
+                while size < FLUSH_BYTES and len(batch) < FLUSH_MAX_RECORDS:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        entry = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                    if entry is None:
+                        stop = True
+                        break
+                    batch.append(entry)
+                    lines.append(_to_line(entry))
+                    size += len(lines[-1])
+                try:
+                    f.write("".join(lines))
+                    f.flush()
+                    self._update_summary(batch)
+                except Exception:
+                    pass
+
+    def close(self):
+        """Flush pending entries and stop the writer thread"""
+        writer = self._writer
+        if writer is not None and writer.is_alive():
+            self._queue.put(None)
+            writer.join(timeout=5)
+        self._writer = None
+
+    def _update_summary(self, entries):
+        """Fold a whole batch of entries into summary.json with one write (read only once)"""
         summary_file = self.log_dir / "summary.json"
-        summary = {"total_messages": 0, "messages_by_agent": {}, "last_updated": ""}
-        
-        if summary_file.exists():
-            try:
-                with open(summary_file, "r", encoding="utf-8") as f:
-                    summary = json.load(f)
-            except: pass
+        summary = self._summary
+        if summary is None:
+            summary = {"total_messages": 0, "messages_by_agent": {}, "last_updated": ""}
+            if summary_file.exists():
+                try:
+                    with open(summary_file, "r", encoding="utf-8") as f:
+                        summary = json.load(f)
+                except: pass
+            self._summary = summary
             
-        summary["total_messages"] += 1
-        agent = last_entry["from"]
-        summary["messages_by_agent"][agent] = summary["messages_by_agent"].get(agent, 0) + 1
+        summary["total_messages"] += len(entries)
+        by_agent = summary["messages_by_agent"]
+        for entry in entries:
+            agent = entry["from"]
+            by_agent[agent] = by_agent.get(agent, 0) + 1
         summary["last_updated"] = datetime.now().isoformat()
         
         with open(summary_file, "w", encoding="utf-8") as f:
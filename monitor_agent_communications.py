@@ -1,13 +1,45 @@
 import http.server
-import socketserver
 import json
 import os
+import threading
 from pathlib import Path
 from agent_communication_logger import _logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 PORT = 8080
 LOG_DIR = Path("logs/agent_communications")
 
+# path -> ((mtime_ns, size), serialized /api/messages body)
+_cache = {}
+_cache_lock = threading.RLock()
+
+
+def read_messages_body(path):
+    """JSON body for the log at path; re-read only when the file has changed"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return b"[]"
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        messages = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    messages.append(orjson.loads(line) if orjson else json.loads(line))
+                except ValueError:
+                    break  # Torn last line mid-flush; the next write changes the stamp
+        body = orjson.dumps(messages) if orjson else json.dumps(messages).encode()
+        _cache[path] = (stamp, body)
+        return body
+
 class Handler(http.server.SimpleHTTPRequestHandler):
     def do_GET(self):
         if self.path == "/api/messages":
@@ -15,17 +47,13 @@ class Handler(http.server.SimpleHTTPRequestHandler):
             self.send_header("Content-type", "application/json")
             self.end_headers()
             
-            messages = []
+            body = b"[]"
             try:
-                log_file = _logger.log_file
-                if log_file.exists():
-                    with open(log_file, "r", encoding="utf-8") as f:
-                        for line in f:
-                            messages.append(json.loads(line))
+                body = read_messages_body(str(_logger.log_file))
             except Exception as e:
                 print(f"Error reading logs: {e}")
                 
-            self.wfile.write(json.dumps(messages).encode())
+            self.wfile.write(body)
             return
             
         if self.path == "/":
@@ -74,6 +102,7 @@ class Handler(http.server.SimpleHTTPRequestHandler):
 
 if __name__ == "__main__":
     os.makedirs(LOG_DIR, exist_ok=True)
-    with socketserver.TCPServer(("", PORT), Handler) as httpd:
+    # One thread per request, so a slow client never stalls the 3s pollers
+    with http.server.ThreadingHTTPServer(("", PORT), Handler) as httpd:
         print(f"Serving at http://localhost:{PORT}")
         httpd.serve_forever()
@@ -5,122 +5,199 @@ This script initializes and coordinates all project agents using DeepSeek LLM
 """
 
 import asyncio
+import atexit
+import functools
 import logging
+import logging.handlers
 import json
+import mmap
+import queue
+import re
+import time
 from datetime import datetime
 from typing import Dict, List
 import yaml
 import sys
 import os
 import random
-
-# Add src to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
-# Add parent directory to path to find agent_communication_logger
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-
-try:
-    from agent_communication_logger import log_agent_message
-except ImportError:
-    # Fallback if module not found
-    def log_agent_message(*args, **kwargs): pass
-
-try:
-    from src.utils.llm_client import DeepSeekClient
-except ImportError:
-    # Fallback path if run from scripts/
-    try:
-        sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'utils'))
-        from llm_client import DeepSeekClient
-    except ImportError:
-        DeepSeekClient = None
-
-# Feature 2: Telegram Notifier
-try:
-    from utils.telegram_notifier import TelegramNotifier
-except ImportError:
-    TelegramNotifier = None
-
-# Feature 7: Web Dashboard
-try:
-    from utils.dashboard import Dashboard
-except ImportError:
-    Dashboard = None
-
-# Feature 8: Voting System
-try:
-    from utils.voting import VotingSystem
-except ImportError:
-    VotingSystem = None
-
-# Feature 9: Shared Memory
-try:
-    from utils.shared_memory import SharedMemory
-except ImportError:
-    SharedMemory = None
-
-# Feature 13: Walk-Forward Optimization
 try:
-    from utils.walk_forward import WalkForwardOptimizer
+    import orjson
 except ImportError:
-    WalkForwardOptimizer = None
-
-# Feature 15: Paper Trading
+    orjson = None
 try:
-    from utils.paper_trading import PaperTrader
+    import pygit2
 except ImportError:
-    PaperTrader = None
+    pygit2 = None
 
-# Feature 16: Performance Leaderboard
-try:
-    from utils.leaderboard import Leaderboard
-except ImportError:
-    Leaderboard = None
+# Run as a script: put the repo root on sys.path once so `src` and
+# agent_communication_logger resolve as top-level packages
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
-# Feature 17: Auto-Recovery
 try:
-    from utils.auto_recovery import AutoRecovery
-except ImportError:
-    AutoRecovery = None
-
-# Feature 18: Agent Health Monitor
-try:
-    from utils.agent_health import AgentHealthMonitor
+    from agent_communication_logger import log_agent_message
 except ImportError:
-    AgentHealthMonitor = None
+    # Fallback if module not found
+    def log_agent_message(*args, **kwargs): pass
 
-# Feature 23: Daily Summary Report
-try:
-    from utils.daily_report import DailyReporter
-except ImportError:
-    DailyReporter = None
+from src.utils.llm_client import DeepSeekClient
+from src.utils.backlog_manager import BacklogManager
 
 # Configure logging
 # Configure logging with UTF-8
 sys.stdout.reconfigure(encoding='utf-8')
+# Records go through a queue; a listener thread does the file/console I/O
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler('logs/agents_startup.log', encoding='utf-8'),
+    logging.StreamHandler(sys.stdout)
+]
+for _h in _log_handlers:
+    _h.setFormatter(_log_formatter)
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+# format='%(message)s' keeps QueueHandler from pre-formatting records; the
+# listener's handlers apply the real format
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/agents_startup.log', encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
+    format='%(message)s',
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
 # DeepSeek API Key - load from environment variable
+_ENV_KEY_RE = re.compile(rb'^[ \t]*DEEPSEEK_API_KEY=["\']?([^"\'\r\n]*)', re.M)
 API_KEY = os.environ.get("DEEPSEEK_API_KEY", "")
 if not API_KEY:
     # Try loading from .env file
     env_path = os.path.join(os.path.dirname(__file__), '..', '.env')
-    if os.path.exists(env_path):
-        with open(env_path, 'r') as f:
-            for line in f:
-                if line.strip().startswith('DEEPSEEK_API_KEY='):
-                    API_KEY = line.strip().split('=', 1)[1].strip('"').strip("'")
+    # mmap cannot map an empty file, hence the size check
+    if os.path.exists(env_path) and os.path.getsize(env_path):
+        # One regex scan over the page-cached file instead of per-line parsing
+        with open(env_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            match = _ENV_KEY_RE.search(m)
+        if match:
+            API_KEY = match.group(1).decode().strip()
     if not API_KEY:
         logger.warning("DEEPSEEK_API_KEY not set! Agents will run without LLM.")
 
+# Prefer the libyaml C loader when available
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_yaml(path: str) -> Dict:
+    """Parse a YAML file once per path"""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_project_context(path: str) -> str:
+    """Read project_context.md once per process ("" if missing or unreadable)"""
+    if not os.path.exists(path):
+        return ""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except Exception:
+        return ""
+
+
+# Interned priority/assignee constants shared by the static task pools
+_HIGH = sys.intern("high")
+_MED = sys.intern("medium")
+_DS = sys.intern("data_scientist")
+_QUANT = sys.intern("quant_analyst")
+_ENG = sys.intern("engineer")
+_DEVOPS = sys.intern("devops")
+
+# orjson (C) for prompt encoding and LLM-reply parsing when available;
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so handlers are unchanged
+_json_loads = orjson.loads if orjson else json.loads
+
+
+def _json_dumps_text(obj) -> str:
+    """Indented JSON text for prompts"""
+    if orjson:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, indent=2, default=str)
+
+
+# First JSON array in an LLM reply (task plans, SPLIT subtasks)
+_JSON_ARRAY_RE = re.compile(r'\[[\s\S]*\]')
+_VALID_AGENTS = frozenset({_DS, _QUANT, _ENG, _DEVOPS})
+
+# Keyword detection in PM escalation replies and votes (single C-level scan each)
+_PM_DECISIONS = ("REASSIGN", "SPLIT", "SKIP")
+_PM_DECISION_RE = re.compile("|".join(_PM_DECISIONS), re.IGNORECASE)
+_APPROVE_RE = re.compile("approve", re.IGNORECASE)
+# Code-review findings that warrant an Auto-Fix task (reviews may be in Vietnamese)
+_BUG_RE = re.compile(r"bug|error|lỗi|fix|critical|security", re.IGNORECASE)
+
+# Session ID mapping for logger; interned so hot-path dict lookups and
+# comparisons short-circuit on identity
+AGENT_IDS = {
+    name: sys.intern(session_id) for name, session_id in {
+        "project_manager": "agent:main:subagent:12b2e050-8ff9-4f2a-af19-5f362ae546fb",
+        "data_scientist": "agent:main:subagent:6a1a837e-d912-4889-abd8-3127c8f4d42a",
+        "quant_analyst": "agent:main:subagent:003e337a-e6fe-4035-b8e5-0d754a447f6c",
+        "engineer": "agent:main:subagent:875988ba-7250-4c5b-883b-7b226735e4e0",
+        "devops": "agent:main:subagent:9bd475bd-9f19-4bff-83b7-b1ee2ab962be",
+        "risk_manager": "agent:main:subagent:f4a12b3c-7890-4def-abcd-1234567890ab",
+        "trading_assistant": "agent:main:subagent:88c8ab35-081f-4567-8f12-cd92dafaa755",
+        "main_system": "agent:main:main",
+    }.items()
+}
+
+# Fallback tasks used when PM auto-planning cannot produce a plan
+_FALLBACK_POOL = (
+    {
+        "title": "Optimize strategy parameters",
+        "description": "Use grid search to find optimal SMA periods and RSI thresholds. Test SMA(10,30), SMA(15,45), SMA(20,50) combinations. Report best Sharpe ratio.",
+        "assigned_to": _QUANT,
+        "priority": _HIGH
+    },
+    {
+        "title": "Add risk management module",
+        "description": "Write risk_manager.py in workspace/: implement position sizing (Kelly criterion), drawdown limits (max 5%), and portfolio heat tracking.",
+        "assigned_to": _ENG,
+        "priority": _HIGH
+    },
+    {
+        "title": "Download additional currency pairs",
+        "description": "Download 3 months data for GBPUSD, USDJPY, AUDUSD using yfinance. Save each as CSV in workspace/. Report statistics.",
+        "assigned_to": _DS,
+        "priority": _MED
+    },
+    {
+        "title": "Create performance report generator",
+        "description": "Write report_generator.py in workspace/: read backtest results and generate a summary report with equity curve data, drawdown chart data, and monthly returns.",
+        "assigned_to": _DS,
+        "priority": _MED
+    },
+    {
+        "title": "Setup automated deployment script",
+        "description": "Write deploy.py in workspace/: automated deployment script that validates all workspace files, runs health checks, and generates deployment report.",
+        "assigned_to": _DEVOPS,
+        "priority": _MED
+    }
+)
+
+
+async def _read_capped(stream: asyncio.StreamReader, cap: int) -> bytes:
+    """Read a subprocess pipe to EOF, keeping only the first cap bytes (the rest is drained)"""
+    buf = bytearray()
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            return bytes(buf)
+        if len(buf) < cap:
+            buf += chunk[:cap - len(buf)]
+
+
 class ProjectManager:
     """Project Manager Agent - Coordinates all other agents"""
     
@@ -135,96 +212,170 @@ class ProjectManager:
             'agents_active': 0,
             'last_checkin': None
         }
-        
-        # Session ID mapping for logger
-        self.agent_ids = {
-            "project_manager": "agent:main:subagent:12b2e050-8ff9-4f2a-af19-5f362ae546fb",
-            "data_scientist": "agent:main:subagent:6a1a837e-d912-4889-abd8-3127c8f4d42a",
-            "quant_analyst": "agent:main:subagent:003e337a-e6fe-4035-b8e5-0d754a447f6c",
-            "engineer": "agent:main:subagent:875988ba-7250-4c5b-883b-7b226735e4e0",
-            "devops": "agent:main:subagent:9bd475bd-9f19-4bff-83b7-b1ee2ab962be",
-            "risk_manager": "agent:main:subagent:f4a12b3c-7890-4def-abcd-1234567890ab",
-            "trading_assistant": "agent:main:subagent:88c8ab35-081f-4567-8f12-cd92dafaa755",
-            "main_system": "agent:main:main"
-        }
+        self._shutdown_done = False
+        self.reports_dir = 'reports'
+        os.makedirs(self.reports_dir, exist_ok=True)
+        self._workspace_scan = None  # entries memo for _scan_workspace, see _invalidate_workspace_scan
+        self._telegram_buffer = []  # per-phase notices, see _flush_notifications
+        self._last_plan = None  # (plan state key, PM response) memo for pm_auto_plan
+        # One backlog handle shared by every phase of every cycle
+        self.backlog = BacklogManager()
+        # Set whenever agents or task statuses change; wakes the status monitor
+        self._state_changed = asyncio.Event()
+        
+        # Session ID mapping for logger (shared, interned)
+        self.agent_ids = AGENT_IDS
         
         self.my_id = self.agent_ids["project_manager"]
         self.api_key = API_KEY
         if DeepSeekClient:
-            self.llm = DeepSeekClient(api_key=API_KEY)
+            self.llm = DeepSeekClient.shared(API_KEY)
         else:
             self.llm = None
         
         # Load project context
-        self.project_context = ""
-        context_path = os.path.join(os.path.dirname(__file__), '..', 'project_context.md')
-        if os.path.exists(context_path):
-            try:
-                with open(context_path, 'r', encoding='utf-8') as f:
-                    self.project_context = f.read()
-                logger.info(f"PM loaded project context ({len(self.project_context)} chars)")
-            except Exception:
-                pass
-        
-        # Feature 2: Telegram Notifier
-        self.telegram = TelegramNotifier() if TelegramNotifier else None
-        
-        # Feature 7: Web Dashboard
-        self.dashboard = Dashboard(port=self.config.get('dashboard', {}).get('port', 8080)) if Dashboard else None
-        
-        # Feature 8: Voting System
-        self.voting = VotingSystem() if VotingSystem else None
-        
-        # Feature 9: Shared Memory
-        self.shared_memory = SharedMemory() if SharedMemory else None
-        
-        # Feature 13: Walk-Forward Optimizer
-        self.walk_forward = WalkForwardOptimizer() if WalkForwardOptimizer else None
-        
-        # Feature 15: Paper Trading
-        self.paper_trader = PaperTrader() if PaperTrader else None
-        
-        # Feature 16: Performance Leaderboard
-        self.leaderboard = Leaderboard() if Leaderboard else None
-        
-        # Feature 17: Auto-Recovery
-        self.recovery = AutoRecovery() if AutoRecovery else None
-        
-        # Feature 18: Agent Health Monitor
-        self.health_monitor = AgentHealthMonitor() if AgentHealthMonitor else None
-        
-        # Feature 23: Daily Summary Report
-        self.daily_reporter = DailyReporter(telegram_notifier=self.telegram) if DailyReporter else None
-    
-    def pm_think(self, task: str, context: str = "") -> str:
-        """PM uses LLM to make decisions with full project awareness"""
-        if not self.llm:
-            return "PM thinking unavailable (no LLM)."
-        try:
-            prompt = [
-                {"role": "system", "content": f"""You are the Project Manager of an AI Trading Bot team.
+        self.project_context = _load_project_context(
+            os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'project_context.md'))
+        )
+        if self.project_context:
+            logger.info(f"PM loaded project context ({len(self.project_context)} chars)")
+
+        # PM system prompt is fixed for the process lifetime; build it once
+        self._pm_system_prompt = f"""You are the Project Manager of an AI Trading Bot team.
                 You coordinate 4 agents: Data Scientist, Quant Analyst, Engineer, DevOps.
-                
+
                 {self.project_context}
-                
+
                 Your responsibilities:
                 - Assign tasks based on backlog priority and dependencies
                 - Monitor progress and resolve blockers
                 - Make decisions about project direction
                 - Ensure quality and deadlines are met
-                
-                Reply in Vietnamese. Be concise and action-oriented."""},
+
+                Reply in Vietnamese. Be concise and action-oriented."""
+    
+    # Optional features are imported and constructed on first use, so a run
+    # that never touches a feature never pays for its import.
+    
+    @functools.cached_property
+    def telegram(self):
+        """Feature 2: Telegram Notifier"""
+        try:
+            from src.utils.telegram_notifier import TelegramNotifier
+        except ImportError:
+            return None
+        return TelegramNotifier()
+    
+    @functools.cached_property
+    def dashboard(self):
+        """Feature 7: Web Dashboard"""
+        try:
+            from src.utils.dashboard import Dashboard
+        except ImportError:
+            return None
+        return Dashboard(port=self.config.get('dashboard', {}).get('port', 8080))
+    
+    @functools.cached_property
+    def voting(self):
+        """Feature 8: Voting System"""
+        try:
+            from src.utils.voting import VotingSystem
+        except ImportError:
+            return None
+        return VotingSystem()
+    
+    @functools.cached_property
+    def shared_memory(self):
+        """Feature 9: Shared Memory"""
+        try:
+            from src.utils.shared_memory import SharedMemory
+        except ImportError:
+            return None
+        return SharedMemory()
+    
+    @functools.cached_property
+    def walk_forward(self):
+        """Feature 13: Walk-Forward Optimizer"""
+        try:
+            from src.utils.walk_forward import WalkForwardOptimizer
+        except ImportError:
+            return None
+        return WalkForwardOptimizer()
+    
+    @functools.cached_property
+    def paper_trader(self):
+        """Feature 15: Paper Trading"""
+        try:
+            from src.utils.paper_trading import PaperTrader
+        except ImportError:
+            return None
+        return PaperTrader()
+    
+    @functools.cached_property
+    def leaderboard(self):
+        """Feature 16: Performance Leaderboard"""
+        try:
+            from src.utils.leaderboard import Leaderboard
+        except ImportError:
+            return None
+        return Leaderboard()
+    
+    @functools.cached_property
+    def recovery(self):
+        """Feature 17: Auto-Recovery"""
+        try:
+            from src.utils.auto_recovery import AutoRecovery
+        except ImportError:
+            return None
+        return AutoRecovery()
+    
+    @functools.cached_property
+    def health_monitor(self):
+        """Feature 18: Agent Health Monitor"""
+        try:
+            from src.utils.agent_health import AgentHealthMonitor
+        except ImportError:
+            return None
+        return AgentHealthMonitor()
+    
+    @functools.cached_property
+    def decision_cache(self):
+        """Semantic cache for enumerated PM/voter decisions"""
+        try:
+            from src.utils.semantic_cache import SemanticCache
+        except ImportError:
+            return None
+        return SemanticCache()
+    
+    @functools.cached_property
+    def daily_reporter(self):
+        """Feature 23: Daily Summary Report"""
+        try:
+            from src.utils.daily_report import DailyReporter
+        except ImportError:
+            return None
+        return DailyReporter(telegram_notifier=self.telegram)
+    
+    async def pm_think(self, task: str, context: str = "", pack: bool = False) -> str:
+        """
+        PM uses LLM to make decisions with full project awareness.
+        pack=True lets short-answer decisions share a batched call with concurrent ones.
+        """
+        if not self.llm:
+            return "PM thinking unavailable (no LLM)."
+        try:
+            prompt = [
+                {"role": "system", "content": self._pm_system_prompt},
                 {"role": "user", "content": f"Context: {context}\n\nTask: {task}"}
             ]
-            return self.llm.chat_completion(prompt)
+            return await self.llm.abatched_chat(prompt, pack=pack)
         except Exception as e:
             return f"Error: {e}"
         
     def load_config(self, config_path: str) -> Dict:
         """Load configuration from YAML file"""
         try:
-            with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
+            return _load_yaml(os.path.abspath(config_path))
         except Exception as e:
             logger.error(f"Failed to load config: {e}")
             return {}
@@ -248,8 +399,13 @@ class ProjectManager:
             await agent.initialize()
             self.agents[agent_name] = agent
             self.project_status['agents_active'] += 1
+            self._state_changed.set()
             logger.info(f"{agent_name} agent started successfully")
             
+            # Feature 18: Register agent in health monitor
+            if self.health_monitor:
+                self.health_monitor.register_agent(agent_name)
+            
             # Log success
             log_agent_message(
                 from_agent=agent_id,
@@ -298,12 +454,13 @@ class ProjectManager:
             except ImportError:
                 logger.warning("Risk Manager agent not available")
             
-            for agent_name, agent_class in agents_to_start.items():
-                await self.start_agent(agent_name, agent_class)
-                # Feature 18: Register agent in health monitor
-                if self.health_monitor:
-                    self.health_monitor.register_agent(agent_name)
-                await asyncio.sleep(1)
+            # Initialize all agents concurrently; LLM fan-out is capped by the client semaphore
+            await asyncio.gather(
+                *(self.start_agent(agent_name, agent_class) for agent_name, agent_class in agents_to_start.items()),
+                return_exceptions=True
+            )
+            # Keep declaration order regardless of which agent finished first
+            self.agents = {name: self.agents[name] for name in agents_to_start if name in self.agents}
             
         except ImportError as e:
             logger.warning(f"Agent modules check failed: {e}")
@@ -329,32 +486,36 @@ class ProjectManager:
             'agents': {}
         }
         
-        for agent_name, agent in self.agents.items():
-            try:
-                # Ask agent to report status via LLM
-                report = await agent.think("It is the Daily Standup.", "Report your status, yesterday's work, today's plan, and blockers.")
-                
-                status_entry = {
-                    'yesterday': "See log detail",
-                    'today': "See log detail",
-                    'blockers': "None" if "blocker" not in report.lower() else "Possible blockers"
-                }
-                standup_report['agents'][agent_name] = status_entry
-                logger.info(f"{agent_name}: Evaluated status")
-                
-                # Send chat message
-                agent_id = self.agent_ids.get(agent_name)
-                if agent_id:
-                    log_agent_message(
-                        from_agent=agent_id,
-                        to_agent=self.my_id,
-                        message=report,
-                        message_type="status"
-                    )
-                    await asyncio.sleep(1)
-                    
-            except Exception as e:
-                logger.warning(f"{agent_name} status unavailable: {e}")
+        # Ask all agents to report concurrently
+        agent_items = list(self.agents.items())
+        reports = await asyncio.gather(
+            *(agent.think("It is the Daily Standup.", "Report your status, yesterday's work, today's plan, and blockers.")
+              for _, agent in agent_items),
+            return_exceptions=True
+        )
+        
+        for (agent_name, agent), report in zip(agent_items, reports):
+            if isinstance(report, Exception):
+                logger.warning(f"{agent_name} status unavailable: {report}")
+                continue
+            
+            status_entry = {
+                'yesterday': "See log detail",
+                'today': "See log detail",
+                'blockers': "None" if "blocker" not in report.lower() else "Possible blockers"
+            }
+            standup_report['agents'][agent_name] = status_entry
+            logger.info(f"{agent_name}: Evaluated status")
+            
+            # Send chat message
+            agent_id = self.agent_ids.get(agent_name)
+            if agent_id:
+                log_agent_message(
+                    from_agent=agent_id,
+                    to_agent=self.my_id,
+                    message=report,
+                    message_type="status"
+                )
         
         # Save standup report
         self.save_report('daily_standup', standup_report)
@@ -369,35 +530,78 @@ class ProjectManager:
         )
     
     def save_report(self, report_type: str, data: Dict):
-        """Save report to file"""
-        reports_dir = 'reports'
-        os.makedirs(reports_dir, exist_ok=True)
-        filename = f"{reports_dir}/{report_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.yaml"
+        """Save report to file (JSON by default, YAML if reports.format is 'yaml')"""
+        reports_dir = self.reports_dir
+        report_format = self.config.get('reports', {}).get('format', 'json')
+        stamp = time.strftime('%Y%m%d_%H%M%S')
         try:
-            with open(filename, 'w') as f:
-                yaml.dump(data, f, default_flow_style=False)
+            if report_format == 'yaml':
+                filename = f"{reports_dir}/{report_type}_{stamp}.yaml"
+                with open(filename, 'w') as f:
+                    yaml.dump(data, f, default_flow_style=False)
+            else:
+                filename = f"{reports_dir}/{report_type}_{stamp}.json"
+                if orjson:
+                    data_bytes = orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC)
+                else:
+                    data_bytes = json.dumps(data, indent=2, default=str, ensure_ascii=False).encode('utf-8')
+                with open(filename, 'wb') as f:
+                    f.write(data_bytes)
             logger.info(f"Report saved: {filename}")
         except Exception as e:
             logger.error(f"Failed to save report: {e}")
     
     async def monitor_agents_intelligent(self):
-        """Monitor agent status with intelligent interaction"""
+        """
+        Monitor agent status with intelligent interaction.
+        PM check-ins and peer chatter run as independent Poisson processes:
+        each loop sleeps an exponentially distributed delay straight to its next event.
+        Status check-ins are event-driven: they fire when agent/task state changes,
+        or after max_status_interval seconds of quiet.
+        """
         logger.info("Starting intelligent agent monitoring...")
         
+        monitor_cfg = self.config.get('monitoring', {})
+        await asyncio.gather(
+            self._status_watch_loop(monitor_cfg.get('max_status_interval', 60)),
+            self._pm_initiator_loop(monitor_cfg.get('pm_rate', 0.02)),
+            self._peer_chatter_loop(monitor_cfg.get('peer_rate', 0.014))
+        )
+    
+    def _record_checkin(self):
+        self.project_status['last_checkin'] = datetime.now()
+        logger.info(f"Agent status: {self.project_status['agents_active']} active")
+    
+    async def _status_watch_loop(self, max_interval: float):
+        """Record a check-in on every state change, idling at zero cost in between"""
+        while True:
+            try:
+                await asyncio.wait_for(self._state_changed.wait(), timeout=max_interval)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._state_changed.clear()
+            self._record_checkin()
+    
+    async def _pm_initiator_loop(self, rate_per_sec: float):
+        """Manager checks in or starts a discussion, on average rate_per_sec times per second"""
+        if rate_per_sec <= 0:
+            return
+        
         # Manager context
         manager_ctx = "You are overseeing a team of AI agents (Data Scientist, Quant Analyst, Engineer, DevOps). Maintain high standards and ensure collaboration."
         
         while True:
-            self.project_status['last_checkin'] = datetime.now()
-            logger.info(f"Agent status: {self.project_status['agents_active']} active")
+            await asyncio.sleep(random.expovariate(rate_per_sec))
+            if not self.llm or not self.agents:
+                continue
             
-            # Simulate Manager checking in or initiating discussion
-            if random.random() < 0.3 and self.llm: # 30% chance every cycle
+            try:
                 prompt = "Ask a random team member for a status update, assign a small task, or start a technical discussion relevant to ML trading."
-                manager_msg = self.llm.chat_completion([
+                manager_msg = await self.llm.abatched_chat([
                     {"role": "system", "content": manager_ctx},
                     {"role": "user", "content": prompt}
-                ])
+                ], cache=False)
                 
                 # Determine recipient (random for now)
                 target = random.choice(list(self.agents.keys()))
@@ -408,11 +612,22 @@ class ProjectManager:
                 
                 # Target responds
                 await asyncio.sleep(2)
-                response = await target_agent.think(f"Project Manager says: {manager_msg}", "Reply professionally and appropriately to the manager.")
+                response = await target_agent.think(f"Project Manager says: {manager_msg}", "Reply professionally and appropriately to the manager.", cache=False)
                 log_agent_message(target_id, self.my_id, response, "direct")
+            except Exception as e:
+                logger.warning(f"PM check-in failed: {e}")
+    
+    async def _peer_chatter_loop(self, rate_per_sec: float):
+        """Two random agents hold a short exchange, on average rate_per_sec times per second"""
+        if rate_per_sec <= 0:
+            return
+        
+        while True:
+            await asyncio.sleep(random.expovariate(rate_per_sec))
+            if len(self.agents) < 2:
+                continue
             
-            # Chance for peer-to-peer chatter
-            elif random.random() < 0.3 and len(self.agents) > 1:
+            try:
                 agents_list = list(self.agents.keys())
                 sender_name = random.choice(agents_list)
                 receiver_name = random.choice([a for a in agents_list if a != sender_name])
@@ -423,19 +638,22 @@ class ProjectManager:
                 receiver_id = self.agent_ids.get(receiver_name)
                 
                 # Sender initiates
-                init_msg = await sender.think(f"You want to discuss something with {receiver_name}.", "Start a technical conversation relevant to your roles.")
+                init_msg = await sender.think(f"You want to discuss something with {receiver_name}.", "Start a technical conversation relevant to your roles.", cache=False)
                 log_agent_message(sender_id, receiver_id, init_msg, "direct")
                 
                 await asyncio.sleep(2)
                 
                 # Receiver responds
-                reply_msg = await receiver.think(f"{sender_name} said: {init_msg}", "Reply to the colleague.")
+                reply_msg = await receiver.think(f"{sender_name} said: {init_msg}", "Reply to the colleague.", cache=False)
                 log_agent_message(receiver_id, sender_id, reply_msg, "direct")
-
-            await asyncio.sleep(15)  # Check every 15 seconds
+            except Exception as e:
+                logger.warning(f"Peer chatter failed: {e}")
     
     async def shutdown(self):
-        """Graceful shutdown of all agents"""
+        """Graceful shutdown of all agents (idempotent)"""
+        if self._shutdown_done:
+            return
+        self._shutdown_done = True
         logger.info("Shutting down agents...")
         log_agent_message(
             from_agent=self.my_id,
@@ -454,8 +672,7 @@ class ProjectManager:
 
     async def assign_initial_tasks(self):
         """Populate backlog if empty"""
-        from utils.backlog_manager import BacklogManager
-        backlog = BacklogManager()
+        backlog = self.backlog
         
         if not backlog.get_all_tasks():
             logger.info("Populating backlog with trading strategy tasks...")
@@ -502,21 +719,21 @@ class ProjectManager:
         Continuous pipeline: keep processing backlog until all tasks are done.
         Handles dependency chains and agent-to-agent handoffs.
         """
-        from utils.backlog_manager import BacklogManager
-        backlog = BacklogManager()
+        backlog = self.backlog
         
         logger.info("=" * 60)
         logger.info("CONTINUOUS PIPELINE STARTED")
         logger.info("=" * 60)
         
         # PM analyzes the backlog first
-        pm_analysis = self.pm_think(
+        pm_analysis = await self.pm_think(
             "Review current backlog and plan execution order",
             f"Backlog: {backlog.get_summary()}\nTasks: {[t['title'] + ' (' + t['status'] + ')' for t in backlog.get_all_tasks()]}"
         )
         log_agent_message(self.my_id, "ALL", f"📊 PM Strategy: {pm_analysis}", "status")
         
         max_pipeline_rounds = 10  # Safety limit
+        uncommitted_rounds = []
         
         for pipeline_round in range(1, max_pipeline_rounds + 1):
             # Check if all tasks are done
@@ -531,25 +748,17 @@ class ProjectManager:
             
             logger.info(f"\n--- Pipeline Round {pipeline_round} | {len(done)}/{len(tasks)} done, {len(pending)} pending ---")
             
-            # Find tasks that can be executed NOW (deps satisfied)
-            executed_any = False
-            for agent_name, agent in self.agents.items():
-                task = backlog.get_next_task(agent_name)
-                if not task:
-                    continue
-                
-                executed_any = True
-                try:
-                    await asyncio.wait_for(
-                        self._execute_agent_task(agent, agent_name, task, backlog),
-                        timeout=300  # 5 min max per task
-                    )
-                except asyncio.TimeoutError:
-                    logger.error(f"⏰ Task #{task['id']} ({task['title']}) timed out after 5 minutes! Marking as blocked.")
-                    backlog.update_status(task["id"], "blocked")
-                    if self.telegram:
-                        self.telegram.send_error(f"⏰ Task #{task['id']} timed out: {task['title']}")
-                await asyncio.sleep(self.config.get('pipeline', {}).get('pause_between_tasks', 3))
+            # Find tasks that can be executed NOW (deps satisfied) and run them concurrently
+            ready = [(agent_name, agent, backlog.get_next_task(agent_name)) for agent_name, agent in self.agents.items()]
+            ready = [r for r in ready if r[2]]
+            # Dispatch in scheduler order: SLA-breached, urgent and short tasks start first
+            ready.sort(key=lambda r: backlog.score_task(r[2]), reverse=True)
+            executed_any = bool(ready)
+            if ready:
+                await asyncio.gather(*(
+                    self._run_pipeline_task(agent, agent_name, task, backlog)
+                    for agent_name, agent, task in ready
+                ))
             
             if not executed_any:
                 blocked_tasks = [t for t in pending if t["status"] == "todo"]
@@ -565,15 +774,17 @@ class ProjectManager:
                         break
                 await asyncio.sleep(5)
             
-            # Auto git commit after each round
-            if self.config.get('pipeline', {}).get('auto_git_commit', True):
-                tools = None
-                for a in self.agents.values():
-                    if a.tools:
-                        tools = a.tools
-                        break
-                if tools:
-                    tools.git_commit(f"pipeline round {pipeline_round}: {backlog.get_summary()}")
+            # Record the round; committed once when the pipeline ends
+            uncommitted_rounds.append(f"pipeline round {pipeline_round}: {backlog.get_summary()}")
+        
+        # Single git commit covering every round
+        if uncommitted_rounds and self.config.get('pipeline', {}).get('auto_git_commit', True):
+            for a in self.agents.values():
+                if a.tools:
+                    a.tools.git_commit(
+                        f"pipeline: {len(uncommitted_rounds)} rounds\n\n" + "\n".join(uncommitted_rounds)
+                    )
+                    break
         
         # Final git push
         if self.config.get('pipeline', {}).get('auto_git_push', True):
@@ -583,10 +794,27 @@ class ProjectManager:
                     logger.info(f"Final push: {push_result}")
                     break
     
+    async def _run_pipeline_task(self, agent, agent_name: str, task: Dict, backlog):
+        """Run one agent's task with the per-task timeout, then pause with per-agent jitter"""
+        try:
+            await asyncio.wait_for(
+                self._execute_agent_task(agent, agent_name, task, backlog),
+                timeout=300  # 5 min max per task
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"⏰ Task #{task['id']} ({task['title']}) timed out after 5 minutes! Marking as blocked.")
+            backlog.update_status(task["id"], "blocked")
+            if self.telegram:
+                self.telegram.send_error(f"⏰ Task #{task['id']} timed out: {task['title']}")
+        except Exception as e:
+            logger.error(f"Task #{task['id']} ({task['title']}) crashed: {e}")
+            backlog.update_status(task["id"], "blocked")
+        self._invalidate_workspace_scan()  # the agent may have written or rewritten files
+        self._state_changed.set()
+        await asyncio.sleep(random.uniform(0, self.config.get('pipeline', {}).get('pause_between_tasks', 3)))
+    
     async def _execute_agent_task(self, agent, agent_name: str, task: Dict, backlog):
         """Execute a single task with self-correction, error escalation, and notifications"""
-        from utils.backlog_manager import BacklogManager
-        
         task_id = task["id"]
         agent_id = self.agent_ids.get(agent_name)
         max_retries = self.config.get('agents', {}).get(agent_name, {}).get('max_retries', 3)
@@ -667,9 +895,10 @@ class ProjectManager:
             
             # PM reviews the result with AI
             if rounds_used > 1:
-                pm_review = self.pm_think(
+                pm_review = await self.pm_think(
                     f"Agent {agent_name} completed task '{task['title']}' but needed {rounds_used} retries. Assess quality.",
-                    f"Result: {result.get('output', '')[:300]}"
+                    f"Result: {result.get('output', '')[:300]}",
+                    pack=True
                 )
                 log_agent_message(self.my_id, agent_id, f"📝 PM Review: {pm_review}", "status")
         else:
@@ -684,8 +913,8 @@ class ProjectManager:
         """Find and notify agents whose tasks depend on the completed task"""
         completed_id = completed_task["id"]
         
-        for task in backlog.get_all_tasks():
-            if task.get("depends_on") == completed_id and task["status"] == "todo":
+        for task in backlog.get_dependents(completed_id):
+            if task["status"] == "todo":
                 next_agent_name = task["assigned_to"]
                 next_agent = self.agents.get(next_agent_name)
                 
@@ -721,10 +950,8 @@ class ProjectManager:
         if self.telegram:
             self.telegram.send_error(f"Task #{task_id} ({task['title']}) failed: {error[:200]}")
         
-        # Ask PM to decide
-        pm_decision = self.pm_think(
-            "A task has FAILED after all retries. Decide what to do.",
-            f"""Task: #{task_id} — {task['title']}
+        # Ask PM to decide (near-duplicate failures reuse an earlier decision)
+        escalation_context = f"""Task: #{task_id} — {task['title']}
 Agent: {agent_name}
 Error: {error[:500]}
 Rounds attempted: {rounds_used}
@@ -735,13 +962,24 @@ OPTIONS (reply with ONE keyword only):
 3. SPLIT — Break into 2 smaller sub-tasks
 
 Reply with: SKIP, REASSIGN, or SPLIT"""
-        )
-        
-        decision = "SKIP"  # Default
-        for keyword in ["REASSIGN", "SPLIT", "SKIP"]:
-            if keyword in pm_decision.upper():
-                decision = keyword
-                break
+        decision = None
+        if self.decision_cache:
+            from src.utils.semantic_cache import escalation_key
+            cache_namespace, cache_key = escalation_key(task['title'], agent_name, error[:500])
+            decision = self.decision_cache.lookup(cache_namespace, cache_key)
+        if decision is None:
+            pm_decision = await self.pm_think(
+                "A task has FAILED after all retries. Decide what to do.",
+                escalation_context,
+                pack=True
+            )
+            
+            # One case-insensitive scan; REASSIGN > SPLIT > SKIP when several appear
+            found = {m.upper() for m in _PM_DECISION_RE.findall(pm_decision)}
+            decision = next((k for k in _PM_DECISIONS if k in found), None)
+            if decision and self.decision_cache:
+                self.decision_cache.store(cache_namespace, cache_key, decision)
+            decision = decision or "SKIP"  # Default
         
         logger.info(f"📋 PM Decision for task #{task_id}: {decision}")
         log_agent_message(self.my_id, "ALL", f"📋 PM Escalation: Task #{task_id} → {decision}", "status")
@@ -757,9 +995,7 @@ Reply with: SKIP, REASSIGN, or SPLIT"""
                 new_agent = random.choice(available_agents)
                 backlog.update_status(task_id, "blocked")
                 # Create a new reassigned task
-                from utils.backlog_manager import BacklogManager
-                bm = BacklogManager()
-                bm.add_task(
+                backlog.add_task(
                     title=f"[REASSIGNED] {task['title']}",
                     description=f"[Reassigned from {agent_name}] {task['description']}",
                     assigned_to=new_agent,
@@ -772,19 +1008,16 @@ Reply with: SKIP, REASSIGN, or SPLIT"""
         elif decision == "SPLIT":
             backlog.update_status(task_id, "blocked")
             # PM generates subtasks using AI
-            split_response = self.pm_think(
+            split_response = await self.pm_think(
                 "Split this failed task into 2 smaller, simpler sub-tasks.",
                 f"Task: {task['title']}\nDescription: {task['description']}\nAssigned to: {agent_name}\n\nReply with JSON: [{{\"title\": \"...\", \"description\": \"...\"}}]"
             )
-            import re as escalation_re
             try:
-                match = escalation_re.search(r'\[[\s\S]*\]', split_response)
+                match = _JSON_ARRAY_RE.search(split_response)
                 if match:
-                    subtasks = json.loads(match.group())
-                    from utils.backlog_manager import BacklogManager
-                    bm = BacklogManager()
+                    subtasks = _json_loads(match.group())
                     for st in subtasks[:2]:
-                        bm.add_task(
+                        backlog.add_task(
                             title=st.get("title", "Subtask"),
                             description=st.get("description", task['description']),
                             assigned_to=agent_name,
@@ -794,46 +1027,189 @@ Reply with: SKIP, REASSIGN, or SPLIT"""
             except Exception as e:
                 logger.error(f"Failed to split task: {e}")
 
+    # ---- Feature 19: Git branch per cycle ----
+    
+    @functools.cached_property
+    def git_repo(self):
+        """In-process libgit2 session for the project repo (None without pygit2)"""
+        if not pygit2:
+            return None
+        try:
+            return pygit2.Repository(self.repo_dir)
+        except Exception as e:
+            logger.warning(f"pygit2 could not open repo, falling back to git CLI: {e}")
+            return None
+    
+    @property
+    def repo_dir(self) -> str:
+        return os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    
+    def _git_cli(self, *args):
+        import subprocess
+        subprocess.run(["git", *args], capture_output=True, cwd=self.repo_dir, timeout=10)
+    
+    def _git_commit_all(self, repo, message: str):
+        """Stage everything and commit on HEAD; no-op when the tree is unchanged"""
+        index = repo.index
+        index.add_all()
+        index.write()
+        tree = index.write_tree()
+        head = repo.head.peel(pygit2.Commit)
+        if tree == head.tree.id:
+            return
+        sig = repo.default_signature
+        repo.create_commit('HEAD', sig, sig, message, tree, [head.id])
+    
+    def git_start_cycle(self, cycle: int):
+        """Create and check out branch cycle-N"""
+        self._invalidate_workspace_scan()
+        branch_name = f"cycle-{cycle}"
+        try:
+            repo = self.git_repo
+            if repo is not None:
+                branch = repo.branches.local.get(branch_name)
+                if branch is None:
+                    branch = repo.branches.local.create(branch_name, repo.head.peel(pygit2.Commit))
+                repo.checkout(branch)
+            else:
+                self._git_cli("checkout", "-b", branch_name)
+            logger.info(f"🌿 Created branch: {branch_name}")
+        except Exception as e:
+            logger.warning(f"Git branch setup failed: {e}")
+    
+    def git_finish_cycle(self, cycle: int):
+        """Commit the cycle's work on cycle-N and merge it back into main"""
+        self._invalidate_workspace_scan()
+        branch_name = f"cycle-{cycle}"
+        try:
+            repo = self.git_repo
+            if repo is None:
+                self._git_cli("add", "-A")
+                self._git_cli("commit", "-m", f"Cycle #{cycle} complete")
+                self._git_cli("checkout", "main")
+                self._git_cli("merge", branch_name, "--no-edit")
+                logger.info(f"🌿 Merged {branch_name} → main")
+                return
+            
+            self._git_commit_all(repo, f"Cycle #{cycle} complete")
+            branch_target = repo.branches.local[branch_name].target
+            main = repo.branches.local['main']
+            repo.checkout(main)
+            analysis, _ = repo.merge_analysis(branch_target)
+            if analysis & pygit2.GIT_MERGE_ANALYSIS_UP_TO_DATE:
+                pass
+            elif analysis & pygit2.GIT_MERGE_ANALYSIS_FASTFORWARD:
+                repo.checkout_tree(repo.get(branch_target))
+                main.set_target(branch_target)
+            else:
+                repo.merge(branch_target)
+                if repo.index.conflicts is not None:
+                    repo.state_cleanup()
+                    repo.reset(repo.head.target, pygit2.GIT_RESET_HARD)
+                    logger.warning(f"🌿 Merge of {branch_name} had conflicts; left unmerged")
+                    return
+                sig = repo.default_signature
+                repo.create_commit(
+                    'HEAD', sig, sig, f"Merge branch '{branch_name}'",
+                    repo.index.write_tree(), [repo.head.target, branch_target]
+                )
+                repo.state_cleanup()
+            logger.info(f"🌿 Merged {branch_name} → main")
+        except Exception as e:
+            logger.warning(f"Git cycle merge failed: {e}")
+    
+    def _queue_telegram(self, text: str):
+        """Buffer a Telegram notice; sent with the rest of the phase by _flush_notifications"""
+        if self.telegram:
+            self._telegram_buffer.append(text)
+    
+    def _flush_notifications(self):
+        """Send all buffered Telegram notices for the phase as one message"""
+        if not self._telegram_buffer:
+            return
+        texts, self._telegram_buffer = self._telegram_buffer, []
+        if self.telegram:
+            self.telegram.send_message("\n\n".join(texts))
+    
+    @property
+    def workspace_dir(self) -> str:
+        return os.path.join(os.path.dirname(__file__), '..', 'workspace')
+    
+    def _scan_workspace(self) -> List[tuple]:
+        """
+        List workspace files as (name, size, is_py, is_backtest) in one scandir pass.
+        Memoized until _invalidate_workspace_scan() (branch switches at cycle start/end and
+        after each agent task); in-place overwrites do not change the directory mtime.
+        """
+        if self._workspace_scan is not None:
+            return self._workspace_scan
+        try:
+            with os.scandir(self.workspace_dir) as it:
+                entries = [
+                    (e.name, e.stat().st_size, e.name.endswith('.py'), 'backtest' in e.name.lower())
+                    for e in it if e.is_file()
+                ]
+        except OSError:
+            return []
+        self._workspace_scan = entries
+        return entries
+    
+    def _invalidate_workspace_scan(self):
+        """Drop the _scan_workspace memo; call whenever workspace files may have been written"""
+        self._workspace_scan = None
+    
     async def _run_backtest(self, agent, task: Dict):
         """Feature 5: Auto-run backtest scripts and capture real results"""
-        import subprocess
+        workspace_dir = self.workspace_dir
+        backtest_files = [name for name, _, is_py, is_backtest in self._scan_workspace() if is_py and is_backtest]
         
-        workspace_dir = os.path.join(os.path.dirname(__file__), '..', 'workspace')
-        backtest_files = [f for f in os.listdir(workspace_dir) if 'backtest' in f.lower() and f.endswith('.py')]
+        # Backtests are independent processes: run them in parallel, one per core
+        backtest_sem = asyncio.Semaphore(os.cpu_count() or 1)
         
-        for bf in backtest_files:
+        async def run_one(bf):
             filepath = os.path.join(workspace_dir, bf)
-            logger.info(f"📊 Running backtest: {bf}...")
-            
-            try:
-                result = subprocess.run(
-                    ["python", filepath],
-                    capture_output=True, text=True, timeout=60,
-                    cwd=workspace_dir
-                )
-                
-                output = result.stdout[:2000] if result.stdout else "No output"
-                errors = result.stderr[:500] if result.stderr else ""
-                
-                if result.returncode == 0:
-                    logger.info(f"📊 Backtest {bf} completed:\n{output[:300]}")
-                    log_agent_message(self.my_id, "ALL", f"📊 Backtest results:\n{output[:500]}", "status")
-                    
-                    if agent.memory:
-                        agent.memory.remember_fact(f"backtest_{bf}", output[:500])
-                    
-                    if self.dashboard:
-                        self.dashboard.add_log(f"📊 Backtest {bf}: SUCCESS")
+            async with backtest_sem:
+                logger.info(f"📊 Running backtest: {bf}...")
+                try:
+                    proc = await asyncio.create_subprocess_exec(
+                        sys.executable, filepath,
+                        cwd=workspace_dir,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE
+                    )
+                    try:
+                        stdout, stderr, _ = await asyncio.wait_for(asyncio.gather(
+                            _read_capped(proc.stdout, 2000),
+                            _read_capped(proc.stderr, 500),
+                            proc.wait()
+                        ), timeout=60)
+                    except asyncio.TimeoutError:
+                        proc.kill()
+                        await proc.wait()
+                        logger.warning(f"📊 Backtest {bf} timeout (60s)")
+                        return
                     
-                    if self.telegram:
-                        self.telegram.send_message(f"📊 *Backtest {bf}:*\n```\n{output[:300]}\n```")
-                else:
-                    logger.warning(f"📊 Backtest {bf} failed: {errors[:200]}")
+                    output = stdout.decode('utf-8', errors='replace') if stdout else "No output"
+                    errors = stderr.decode('utf-8', errors='replace') if stderr else ""
                     
-            except subprocess.TimeoutExpired:
-                logger.warning(f"📊 Backtest {bf} timeout (60s)")
-            except Exception as e:
-                logger.error(f"📊 Backtest error: {e}")
+                    if proc.returncode == 0:
+                        logger.info(f"📊 Backtest {bf} completed:\n{output[:300]}")
+                        log_agent_message(self.my_id, "ALL", f"📊 Backtest results:\n{output[:500]}", "status")
+                        
+                        if agent.memory:
+                            agent.memory.remember_fact(f"backtest_{bf}", output[:500])
+                        
+                        if self.dashboard:
+                            self.dashboard.add_log(f"📊 Backtest {bf}: SUCCESS")
+                        
+                        self._queue_telegram(f"📊 *Backtest {bf}:*\n```\n{output[:300]}\n```")
+                    else:
+                        logger.warning(f"📊 Backtest {bf} failed: {errors[:200]}")
+                        
+                except Exception as e:
+                    logger.error(f"📊 Backtest error: {e}")
+        
+        await asyncio.gather(*(run_one(bf) for bf in backtest_files))
 
     async def _run_code_reviews(self):
         """Feature 4: Engineer reviews all workspace Python files"""
@@ -841,19 +1217,29 @@ Reply with: SKIP, REASSIGN, or SPLIT"""
         if not engineer:
             return
         
-        workspace_dir = os.path.join(os.path.dirname(__file__), '..', 'workspace')
-        if not os.path.exists(workspace_dir):
-            return
-        
-        py_files = [f for f in os.listdir(workspace_dir) if f.endswith('.py')]
+        workspace_dir = self.workspace_dir
+        py_files = [name for name, _, is_py, _ in self._scan_workspace() if is_py]
         if not py_files:
             return
         
         logger.info(f"🔍 Code Review Phase: {len(py_files)} files to review")
         
-        for pyfile in py_files[:5]:  # Max 5 reviews per cycle
-            filepath = os.path.join(workspace_dir, pyfile)
-            review = await engineer.review_code(filepath)
+        # Reviews are independent LLM round-trips: run them concurrently, bounded
+        review_sem = asyncio.Semaphore(int(os.getenv('REVIEW_CONCURRENCY', '5')))
+        
+        async def review_one(pyfile):
+            async with review_sem:
+                return await engineer.review_code(os.path.join(workspace_dir, pyfile))
+        
+        review_files = py_files[:5]  # Max 5 reviews per cycle
+        reviews = await asyncio.gather(*(review_one(f) for f in review_files), return_exceptions=True)
+        
+        dashboard_lines = []
+        existing_titles = None
+        for pyfile, review in zip(review_files, reviews):
+            if isinstance(review, Exception):
+                logger.warning(f"🔍 Review of {pyfile} failed: {review}")
+                continue
             
             if review.get("reviewed"):
                 logger.info(f"🔍 Review of {pyfile}: {review['review'][:150]}...")
@@ -862,20 +1248,19 @@ Reply with: SKIP, REASSIGN, or SPLIT"""
                     f"🔍 Code Review — {pyfile}:\n{review['review'][:300]}",
                     "status"
                 )
-                if self.dashboard:
-                    self.dashboard.add_log(f"🔍 Code review: {pyfile} ✅")
+                dashboard_lines.append(f"🔍 Code review: {pyfile} ✅")
                 
                 # Feature 10: Auto-Fix from Code Review (with dedup)
-                review_text = review.get('review', '').lower()
-                has_bugs = any(word in review_text for word in ['bug', 'error', 'fix', 'critical', 'security'])
+                has_bugs = bool(_BUG_RE.search(review.get('review', '')))
                 if has_bugs:
-                    from utils.backlog_manager import BacklogManager
-                    fix_backlog = BacklogManager()
+                    fix_backlog = self.backlog
                     # DEDUP: Check if Auto-Fix task already exists for this file
-                    existing_tasks = fix_backlog.get_all_tasks()
+                    if existing_titles is None:
+                        existing_titles = {t["title"] for t in fix_backlog.get_all_tasks()}
                     fix_title = f"Auto-Fix: {pyfile}"
-                    already_exists = any(t["title"] == fix_title for t in existing_tasks)
+                    already_exists = fix_title in existing_titles
                     if not already_exists:
+                        existing_titles.add(fix_title)
                         fix_backlog.add_task(
                             title=fix_title,
                             description=f"Fix issues found in code review of {pyfile}:\n{review['review'][:500]}",
@@ -883,10 +1268,12 @@ Reply with: SKIP, REASSIGN, or SPLIT"""
                             priority=2
                         )
                         logger.info(f"🔧 Feature 10: Auto-created fix task for {pyfile}")
-                        if self.telegram:
-                            self.telegram.send_message(f"🔧 Auto-Fix: Code review found issues in {pyfile}, fix task created")
+                        self._queue_telegram(f"🔧 Auto-Fix: Code review found issues in {pyfile}, fix task created")
                     else:
                         logger.info(f"⏭️ Feature 10: Skipping duplicate Auto-Fix for {pyfile} (task already exists)")
+        
+        if self.dashboard and dashboard_lines:
+            self.dashboard.add_logs(dashboard_lines)
 
     async def _run_voting_phase(self, backlog):
         """Feature 8: QA proposes strategy and agents vote"""
@@ -926,12 +1313,22 @@ Reply with: SKIP, REASSIGN, or SPLIT"""
         for voter_name in ["data_scientist", "engineer", "devops"]:
             voter = self.agents.get(voter_name)
             if voter and voter.llm:
+                vote_task = f"Proposal: {proposal_title}\nYour expertise: {voter_name}\nReply with ONLY: approve or reject"
+                namespace = f"vote:{voter_name}"
+                decision = self.decision_cache.lookup(namespace, vote_task) if self.decision_cache else None
+                if decision is not None:
+                    self.voting.vote(proposal['id'], voter_name, decision, "(cached decision)")
+                    continue
+                
                 vote_thought = await voter.think(
                     f"Should we deploy this trading strategy? Consider quality, risk, and readiness.",
-                    f"Proposal: {proposal_title}\nYour expertise: {voter_name}\nReply with ONLY: approve or reject"
+                    vote_task,
+                    pack=True
                 )
                 
-                decision = "approve" if "approve" in (vote_thought or "").lower() else "reject"
+                decision = "approve" if _APPROVE_RE.search(vote_thought or "") else "reject"
+                if self.decision_cache and vote_thought and not vote_thought.startswith("Error"):
+                    self.decision_cache.store(namespace, vote_task, decision)
                 self.voting.vote(proposal['id'], voter_name, decision, vote_thought[:100] if vote_thought else "")
         
         # Tally
@@ -946,51 +1343,29 @@ Reply with: SKIP, REASSIGN, or SPLIT"""
             self.dashboard.update_votes(self.voting._load().get("proposals", []))
             self.dashboard.add_log(f"🗳️ {result}")
 
-    async def pm_auto_plan(self) -> int:
-        """
-        PM Auto-Planning: Analyze completed tasks and generate next wave of work.
-        Returns number of new tasks created.
-        """
-        from utils.backlog_manager import BacklogManager
-        backlog = BacklogManager()
-        
-        tasks = backlog.get_all_tasks()
-        done_tasks = [t for t in tasks if t["status"] == "done"]
-        pending_tasks = [t for t in tasks if t["status"] in ("todo", "in_progress")]
-        
-        # CAP: Don't auto-plan if backlog is already too large
-        MAX_TOTAL_TASKS = 50
-        if len(tasks) >= MAX_TOTAL_TASKS:
-            logger.info(f"Auto-plan skipped: backlog already has {len(tasks)} tasks (max {MAX_TOTAL_TASKS})")
-            return 0
-        
-        if pending_tasks:
-            logger.info(f"Auto-plan skipped: {len(pending_tasks)} tasks still pending")
-            return 0
-        
-        logger.info("\n" + "=" * 60)
-        logger.info("🧠 PM AUTO-PLANNING: Generating next wave of tasks...")
-        logger.info("=" * 60)
-        
-        # Gather context: completed tasks + workspace files
-        workspace_files = []
-        workspace_dir = os.path.join(os.path.dirname(__file__), '..', 'workspace')
-        if os.path.exists(workspace_dir):
-            for f in os.listdir(workspace_dir):
-                filepath = os.path.join(workspace_dir, f)
-                if os.path.isfile(filepath):
-                    size = os.path.getsize(filepath)
-                    workspace_files.append(f"{f} ({size} bytes)")
+    def _indexed_tasks(self):
+        """One backlog read, bucketed by status: (tasks, {status: [tasks]})"""
+        tasks = self.backlog.get_all_tasks()
+        by_status = {"done": [], "todo": [], "in_progress": [], "blocked": []}
+        for t in tasks:
+            by_status.setdefault(t["status"], []).append(t)
+        return tasks, by_status
+    
+    def _build_planning_prompt(self, done_tasks: List[Dict], workspace: List[tuple]) -> str:
+        """Assemble the auto-planning prompt (only called when the PM is actually asked)"""
+        workspace_files = [f"{name} ({size} bytes)" for name, size, _, _ in workspace]
         
         # Gather agent memories
         agent_knowledge = {}
         for agent_name, agent in self.agents.items():
             if agent.memory:
-                facts = agent.memory.recall_fact("all")
-                agent_knowledge[agent_name] = facts if facts else "No memory"
+                try:
+                    facts = agent.memory.recall_fact("all")
+                except Exception:
+                    facts = None
+                agent_knowledge[agent_name] = facts[:500] if facts else "No memory"
         
-        # Ask PM AI to plan next tasks
-        planning_prompt = f"""Analyze completed work and plan the NEXT wave of tasks.
+        return f"""Analyze completed work and plan the NEXT wave of tasks.
 
 COMPLETED TASKS ({len(done_tasks)}):
 {chr(10).join(f"- #{t['id']} [{t['assigned_to']}]: {t['title']}" for t in done_tasks)}
@@ -999,7 +1374,7 @@ WORKSPACE FILES:
 {chr(10).join(f"- {f}" for f in workspace_files) if workspace_files else "No files yet"}
 
 AGENT KNOWLEDGE:
-{json.dumps(agent_knowledge, indent=2, default=str)[:1000]}
+{_json_dumps_text({k: str(v)[:200] for k, v in agent_knowledge.items()})[:1000]}
 
 AVAILABLE AGENTS:
 - data_scientist: Data analysis, ML, feature engineering
@@ -1019,8 +1394,54 @@ RESPOND IN THIS EXACT JSON FORMAT ONLY:
   {{"title": "task title", "description": "detailed description of what to do", "assigned_to": "agent_name", "priority": "high", "depends_on": null}},
   ...
 ]"""
-
-        ai_response = self.pm_think("Generate next wave of tasks", planning_prompt)
+    
+    async def pm_auto_plan(self) -> int:
+        """
+        PM Auto-Planning: Analyze completed tasks and generate next wave of work.
+        Returns number of new tasks created.
+        """
+        backlog = self.backlog
+        backlog.reload()  # other processes/tools may have edited backlog.json
+        
+        tasks, by_status = self._indexed_tasks()
+        done_tasks = by_status["done"]
+        pending_tasks = by_status["todo"] + by_status["in_progress"]
+        
+        # CAP: Don't auto-plan if backlog is already too large
+        MAX_TOTAL_TASKS = 50
+        if len(tasks) >= MAX_TOTAL_TASKS:
+            logger.info(f"Auto-plan skipped: backlog already has {len(tasks)} tasks (max {MAX_TOTAL_TASKS})")
+            return 0
+        
+        if pending_tasks:
+            logger.info(f"Auto-plan skipped: {len(pending_tasks)} tasks still pending")
+            return 0
+        
+        if not done_tasks:
+            logger.info("Auto-plan skipped: no completed tasks to build on")
+            return 0
+        
+        logger.info("\n" + "=" * 60)
+        logger.info("🧠 PM AUTO-PLANNING: Generating next wave of tasks...")
+        logger.info("=" * 60)
+        
+        # Gather context: completed tasks + workspace files
+        workspace = self._scan_workspace()
+        
+        # Same backlog and workspace as a previous plan that created nothing: reuse its response.
+        # Every task id is in the key, so tasks created from a plan (even if later blocked) change it.
+        plan_key = (
+            frozenset(t["id"] for t in done_tasks),
+            frozenset(t["id"] for t in tasks if t["status"] != "done"),
+            frozenset((name, size) for name, size, _, _ in workspace)
+        )
+        if self._last_plan and self._last_plan[0] == plan_key:
+            logger.info("Auto-plan: state unchanged since last plan, reusing PM response")
+            ai_response = self._last_plan[1]
+        else:
+            ai_response = await self.pm_think("Generate next wave of tasks", self._build_planning_prompt(done_tasks, workspace))
+            if not ai_response.startswith("Error"):
+                self._last_plan = (plan_key, ai_response)
         
         # Parse AI response to extract tasks
         new_tasks = self._parse_planned_tasks(ai_response)
@@ -1054,6 +1475,9 @@ RESPOND IN THIS EXACT JSON FORMAT ONLY:
             except Exception as e:
                 logger.error(f"Failed to create task: {e}")
         
+        if created_count:
+            self._last_plan = None  # only a plan that created nothing may be reused
+        
         logger.info(f"✅ PM Auto-Plan complete: {created_count} new tasks created")
         log_agent_message(self.my_id, "ALL", f"🧠 Auto-planned {created_count} new tasks. {backlog.get_summary()}", "status")
         
@@ -1061,19 +1485,17 @@ RESPOND IN THIS EXACT JSON FORMAT ONLY:
     
     def _parse_planned_tasks(self, ai_response: str) -> List[Dict]:
         """Parse AI-generated task list from PM response"""
-        import re
         
         # Try to extract JSON array from response
         try:
             # Find JSON array in response
-            match = re.search(r'\[[\s\S]*\]', ai_response)
+            match = _JSON_ARRAY_RE.search(ai_response)
             if match:
-                tasks = json.loads(match.group())
-                valid_agents = {"data_scientist", "quant_analyst", "engineer", "devops"}
+                tasks = _json_loads(match.group())
                 valid_tasks = []
                 for t in tasks:
                     if isinstance(t, dict) and "title" in t and "assigned_to" in t:
-                        if t["assigned_to"] in valid_agents:
+                        if t["assigned_to"] in _VALID_AGENTS:
                             valid_tasks.append(t)
                 if valid_tasks:
                     return valid_tasks[:5]  # Max 5 tasks per wave
@@ -1085,42 +1507,8 @@ RESPOND IN THIS EXACT JSON FORMAT ONLY:
     def _fallback_tasks(self, done_tasks: List[Dict]) -> List[Dict]:
         """Generate fallback tasks if AI planning fails"""
         done_titles = {t["title"].lower() for t in done_tasks}
-        
-        fallback_pool = [
-            {
-                "title": "Optimize strategy parameters",
-                "description": "Use grid search to find optimal SMA periods and RSI thresholds. Test SMA(10,30), SMA(15,45), SMA(20,50) combinations. Report best Sharpe ratio.",
-                "assigned_to": "quant_analyst",
-                "priority": "high"
-            },
-            {
-                "title": "Add risk management module",
-                "description": "Write risk_manager.py in workspace/: implement position sizing (Kelly criterion), drawdown limits (max 5%), and portfolio heat tracking.",
-                "assigned_to": "engineer",
-                "priority": "high"
-            },
-            {
-                "title": "Download additional currency pairs",
-                "description": "Download 3 months data for GBPUSD, USDJPY, AUDUSD using yfinance. Save each as CSV in workspace/. Report statistics.",
-                "assigned_to": "data_scientist",
-                "priority": "medium"
-            },
-            {
-                "title": "Create performance report generator",
-                "description": "Write report_generator.py in workspace/: read backtest results and generate a summary report with equity curve data, drawdown chart data, and monthly returns.",
-                "assigned_to": "data_scientist",
-                "priority": "medium"
-            },
-            {
-                "title": "Setup automated deployment script",
-                "description": "Write deploy.py in workspace/: automated deployment script that validates all workspace files, runs health checks, and generates deployment report.",
-                "assigned_to": "devops",
-                "priority": "medium"
-            }
-        ]
-        
         # Filter out already completed tasks
-        new_tasks = [t for t in fallback_pool if t["title"].lower() not in done_titles]
+        new_tasks = [dict(t) for t in _FALLBACK_POOL if t["title"].lower() not in done_titles]
         return new_tasks[:4]
 
 
@@ -1194,20 +1582,14 @@ async def main():
                 project_manager.dashboard.set_pipeline_status("running")
             
             # Feature 19: Git branch per cycle
-            import subprocess
-            branch_name = f"cycle-{cycle}"
-            try:
-                subprocess.run(["git", "checkout", "-b", branch_name], capture_output=True,
-                            cwd=os.path.join(os.path.dirname(__file__), '..'), timeout=10)
-                logger.info(f"🌿 Created branch: {branch_name}")
-            except:
-                pass
+            project_manager.git_start_cycle(cycle)
             
             # ---- Phase 1: Pipeline ----
             logger.info("📌 Phase 1: Running pipeline...")
             if project_manager.recovery:
                 project_manager.recovery.set_phase("pipeline")
             await project_manager.run_continuous_pipeline()
+            project_manager._flush_notifications()
             
             # ---- Phase 2: Code Review (Feature 4) — Only every 3 cycles ----
             if cycle % 3 == 1:  # Run on cycle 1, 4, 7, etc.
@@ -1215,6 +1597,7 @@ async def main():
                 if project_manager.recovery:
                     project_manager.recovery.set_phase("code_review")
                 await project_manager._run_code_reviews()
+                project_manager._flush_notifications()
             else:
                 logger.info(f"📌 Phase 2: Code Review skipped (runs every 3 cycles, next at cycle {((cycle // 3) + 1) * 3 + 1})")
             
@@ -1222,9 +1605,7 @@ async def main():
             logger.info("📌 Phase 3: Voting Phase...")
             if project_manager.recovery:
                 project_manager.recovery.set_phase("voting")
-            from utils.backlog_manager import BacklogManager
-            backlog_for_vote = BacklogManager()
-            await project_manager._run_voting_phase(backlog_for_vote)
+            await project_manager._run_voting_phase(project_manager.backlog)
             
             # ---- Phase 4: PM Auto-Planning ----
             logger.info("📌 Phase 4: PM Auto-Planning...")
@@ -1269,12 +1650,11 @@ async def main():
             
             # ---- Phase 8: Telegram pipeline done + notifications ----
             if project_manager.telegram:
-                backlog_summary = BacklogManager()
-                done_count = len([t for t in backlog_summary.get_all_tasks() if t['status'] == 'done'])
-                project_manager.telegram.send_pipeline_done(done_count, cycle)
+                _, by_status = project_manager._indexed_tasks()
+                project_manager.telegram.send_pipeline_done(len(by_status['done']), cycle)
                 
                 if new_tasks > 0:
-                    task_titles = [t['title'] for t in backlog_summary.get_all_tasks() if t['status'] == 'todo'][:5]
+                    task_titles = [t['title'] for t in by_status['todo'][:5]]
                     project_manager.telegram.send_auto_plan(task_titles)
             
             if new_tasks == 0:
@@ -1293,18 +1673,7 @@ async def main():
                 )
             
             # Feature 19: Merge branch back to main
-            try:
-                subprocess.run(["git", "add", "-A"], capture_output=True,
-                            cwd=os.path.join(os.path.dirname(__file__), '..'), timeout=10)
-                subprocess.run(["git", "commit", "-m", f"Cycle #{cycle} complete"],
-                            capture_output=True, cwd=os.path.join(os.path.dirname(__file__), '..'), timeout=10)
-                subprocess.run(["git", "checkout", "main"], capture_output=True,
-                            cwd=os.path.join(os.path.dirname(__file__), '..'), timeout=10)
-                subprocess.run(["git", "merge", branch_name, "--no-edit"], capture_output=True,
-                            cwd=os.path.join(os.path.dirname(__file__), '..'), timeout=10)
-                logger.info(f"🌿 Merged {branch_name} → main")
-            except:
-                pass
+            project_manager.git_finish_cycle(cycle)
             
             # Feature 7: Dashboard cooldown
             if project_manager.dashboard:
@@ -1,8 +1,16 @@
 import yfinance as yf
 import pandas as pd
+# Offline-first: re-runs within an hour are answered from a local SQLite cache
+try:
+    import requests_cache
+    session = requests_cache.CachedSession('.cache/yfinance', expire_after=3600)
+except ImportError:
+    session = None
 print("Testing yfinance download for AAPL...")
 try:
-    df = yf.download("AAPL", period="1mo", progress=False)
+    # A smoke test only needs non-empty data; 5 days instead of a month
+    kwargs = {"session": session} if session else {}
+    df = yf.download("AAPL", period="5d", progress=False, **kwargs)
     if df.empty:
         print("Result: Empty DataFrame")
     else:
@@ -0,0 +1 @@
+"""ML-bot agents source package"""
@@ -0,0 +1 @@
+"""Agent implementations (BaseAgent and role subclasses)"""
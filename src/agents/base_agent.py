@@ -2,37 +2,124 @@ import logging
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List
 import asyncio
-import sys
+import functools
 import os
 import json
+import re
+from collections import deque
+from pathlib import Path
+from types import MappingProxyType
 
-# Add parent directory to path to find agent_communication_logger
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 try:
-    from agent_communication_logger import log_agent_message
+    import orjson
 except ImportError:
-    # Fallback if module not found
-    def log_agent_message(*args, **kwargs): pass
+    orjson = None
 
-# Import DeepSeek Client
 try:
-    # Try importing assuming run from scripts/
-    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-    from utils.llm_client import DeepSeekClient
-    from utils.agent_tools import AgentTools
-    from utils.memory import AgentMemory
-    from utils.shared_memory import SharedMemory
+    from agent_communication_logger import log_agent_message
 except ImportError:
-    DeepSeekClient = None
-    AgentTools = None
-    AgentMemory = None
-    SharedMemory = None
-import re
+    # Fallback if module not found (repo root not on sys.path)
+    def log_agent_message(*args, **kwargs): pass
+
+from ..utils.llm_client import DeepSeekClient
+from ..utils.agent_tools import AgentTools
+from ..utils.memory import AgentMemory
+from ..utils.shared_memory import SharedMemory
+from ..utils.script_runner import ScriptRunnerPool
+
+# Tool-command patterns, compiled once (act() runs on every LLM response).
+# WRITE_FILE blocks are plain delimiter pairs found with str.find (file bodies are
+# the bulk of a reply); the command regex only scans the text between blocks, so
+# commands quoted inside a WRITE_FILE body are never run
+_BLOCK_OPEN = "[WRITE_FILE:"
+_BLOCK_CLOSE = "[END_WRITE_FILE]"
+_COMMAND_RE = re.compile(
+    r"\[JSON_CMD:\s*(?P<json>{.*?})\s*\]"
+    r"|\[CMD:\s*(?P<cmd>\w+)\s*(?P<args>.*?)\]",
+    re.DOTALL
+)
+_ACTION_MARKERS = ("[WRITE_FILE:", "[JSON_CMD:", "[CMD:")
+_ARG_RE = re.compile(r"(\w+)=(?:'([^']*)'|\"([^\"]*)\")", re.DOTALL)
+_FILE_RE = re.compile(r'[\w_]+\.(?:py|csv|json|txt|yaml|md)')
+_WRITTEN_RE = re.compile(r'WRITE_FILE.*?(?:workspace[/\\])?(\w+\.py)')
+
+
+
+def _iter_write_blocks(text: str, pos: int = 0):
+    """Yield (start, end, filename, content) for each complete WRITE_FILE block from pos on"""
+    while True:
+        start = text.find(_BLOCK_OPEN, pos)
+        if start < 0:
+            return
+        name_end = text.find("]", start)
+        if name_end < 0:
+            return
+        body_end = text.find(_BLOCK_CLOSE, name_end)
+        if body_end < 0:
+            return
+        pos = body_end + len(_BLOCK_CLOSE)
+        yield start, pos, text[start + len(_BLOCK_OPEN):name_end], text[name_end + 1:body_end]
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so handlers are unchanged
+_json_loads = orjson.loads if orjson else json.loads
+
+# Rough token estimate (no tokenizer dependency) and the system prompt's token budget
+CHARS_PER_TOKEN = 4
+SYSTEM_PROMPT_TOKEN_BUDGET = 16000
+
+# Characters of a file sent for code review
+REVIEW_MAX_CHARS = 3000
+
+# Fixed prompt segments joined around the per-call parts
+_SHARED_HEADER = "\n\nSHARED KNOWLEDGE FROM OTHER AGENTS:\n"
+_USER_PREFIX = "Here is the context: "
+_USER_TASK = "\n\nTask/Question: "
+_USER_SUFFIX = "\n\nProvide a professional response."
+
+# Pre-warmed interpreters for auto-running written scripts, shared by all agents
+_RUNNER_POOL = ScriptRunnerPool(size=min(4, os.cpu_count() or 1))
+
+# Repo paths, resolved once at import
+REPO_ROOT = Path(__file__).resolve().parents[2]
+WORKSPACE_DIR = str(REPO_ROOT / 'workspace')
+MEMORY_DIR = str(REPO_ROOT / 'memory')
+SHARED_MEMORY_FILE = str(REPO_ROOT / 'shared_memory.json')
+PROJECT_CONTEXT_FILE = str(REPO_ROOT / 'project_context.md')
+
+
+@functools.lru_cache(maxsize=1)
+def _load_project_context(path: str) -> str:
+    """Read project_context.md once per process; every agent shares the same string"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
 
 
 class BaseAgent(ABC):
     """Base class for all ML Trading Bot agents"""
     
+    # Fixed attribute set; subclasses declare their own extra attributes in __slots__
+    __slots__ = (
+        'config', 'name', 'logger', 'is_initialized', 'tasks', 'api_key', '_llm', '_tools',
+        '_memory', 'role_instruction', 'project_context', '_static_prompt', 'shared_memory',
+        'status', 'my_id', 'conversation_history', '__weakref__'
+    )
+    
+    # Role-specific behavior; subclasses override at class level so every instance shares one string
+    ROLE_INSTRUCTION = ""
+    
+    # Session ID mapping for logger (read-only, shared by every agent)
+    AGENT_IDS = MappingProxyType({
+        "project_manager": "agent:main:subagent:12b2e050-8ff9-4f2a-af19-5f362ae546fb",
+        "data_scientist": "agent:main:subagent:6a1a837e-d912-4889-abd8-3127c8f4d42a",
+        "quant_analyst": "agent:main:subagent:003e337a-e6fe-4035-b8e5-0d754a447f6c",
+        "engineer": "agent:main:subagent:875988ba-7250-4c5b-883b-7b226735e4e0",
+        "devops": "agent:main:subagent:9bd475bd-9f19-4bff-83b7-b1ee2ab962be",
+        "risk_manager": "agent:main:subagent:f4a12b3c-7890-4def-abcd-1234567890ab",
+        "trading_assistant": "agent:main:subagent:88c8ab35-081f-4567-8f12-cd92dafaa755",
+        "main_system": "agent:main:main"
+    })
+    
     def __init__(self, config: Dict[str, Any], agent_name: str, api_key: str = None):
         """
         Initialize base agent
@@ -48,43 +135,34 @@ class BaseAgent(ABC):
         self.is_initialized = False
         self.tasks = []
         
-        # Initialize LLM Client
+        # LLM client, tools and memory are created on first use (see the properties below)
         self.api_key = api_key or os.environ.get("DEEPSEEK_API_KEY")
-        self.llm = None
-        self.tools = None
-        self.memory = None
-        self.role_instruction = ""  # Override in subclass for role-specific behavior
+        self._llm = None
+        self._tools = None
+        self._memory = None
+        
+        # Conversation history for context
+        self.conversation_history = deque(maxlen=10)  # Oldest entries drop off on append
+        
+        self.role_instruction = self.ROLE_INSTRUCTION
         self.project_context = ""  # Loaded from project_context.md
+        self._static_prompt = None  # (role_instruction, prompt, est. tokens) memo for _static_system_prompt
         
         # Load project context
-        context_path = os.path.join(os.path.dirname(__file__), '..', '..', 'project_context.md')
-        if os.path.exists(context_path):
+        if os.path.exists(PROJECT_CONTEXT_FILE):
             try:
-                with open(context_path, 'r', encoding='utf-8') as f:
-                    self.project_context = f.read()
+                self.project_context = _load_project_context(PROJECT_CONTEXT_FILE)
                 self.logger.info(f"Loaded project context ({len(self.project_context)} chars)")
             except Exception as e:
                 self.logger.warning(f"Failed to load project context: {e}")
         
-        if AgentTools:
-            self.tools = AgentTools(workspace_dir=os.path.join(os.path.dirname(__file__), '..', '..', 'workspace'))
-
-        if AgentMemory:
-            self.memory = AgentMemory(agent_name=agent_name, memory_dir=os.path.join(os.path.dirname(__file__), '..', '..', 'memory'))
-        
         # Feature 9: Shared memory
         self.shared_memory = None
         if SharedMemory:
-            self.shared_memory = SharedMemory(os.path.join(os.path.dirname(__file__), '..', '..', 'shared_memory.json'))
+            self.shared_memory = SharedMemory(SHARED_MEMORY_FILE)
             
-        if self.api_key and DeepSeekClient:
-            try:
-                self.llm = DeepSeekClient(api_key=self.api_key)
-                self.logger.info(f"LLM Client initialized for {agent_name}")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize LLM: {e}")
-        else:
-            self.logger.warning(f"LLM Client NOT initialized for {agent_name} (Missing API Key or Client)")
+        if not self.api_key:
+            self.logger.warning(f"LLM Client NOT initialized for {agent_name} (Missing API Key)")
         
         # Agent status
         self.status = {
@@ -94,22 +172,34 @@ class BaseAgent(ABC):
             'performance': {}
         }
         
-        # Session ID mapping for logger
-        self.agent_ids = {
-            "project_manager": "agent:main:subagent:12b2e050-8ff9-4f2a-af19-5f362ae546fb",
-            "data_scientist": "agent:main:subagent:6a1a837e-d912-4889-abd8-3127c8f4d42a",
-            "quant_analyst": "agent:main:subagent:003e337a-e6fe-4035-b8e5-0d754a447f6c",
-            "engineer": "agent:main:subagent:875988ba-7250-4c5b-883b-7b226735e4e0",
-            "devops": "agent:main:subagent:9bd475bd-9f19-4bff-83b7-b1ee2ab962be",
-            "trading_assistant": "agent:main:subagent:88c8ab35-081f-4567-8f12-cd92dafaa755",
-            "main_system": "agent:main:main"
-        }
-        
         # Get my ID
-        self.my_id = self.agent_ids.get(agent_name, f"agent:main:{agent_name}")
-        
-        # Conversation history for context
-        self.conversation_history = []
+        self.my_id = self.AGENT_IDS.get(agent_name, f"agent:main:{agent_name}")
+    
+    @property
+    def llm(self):
+        """Shared DeepSeek client, resolved on first use (None without an API key)"""
+        if self._llm is None and self.api_key:
+            try:
+                self._llm = DeepSeekClient.shared(self.api_key)
+                self.logger.info(f"LLM Client initialized for {self.name}")
+            except Exception as e:
+                self.logger.error(f"Failed to initialize LLM: {e}")
+                self._llm = False  # Don't retry on every access
+        return self._llm or None
+    
+    @property
+    def tools(self):
+        """Workspace tools, created on first use"""
+        if self._tools is None:
+            self._tools = AgentTools(workspace_dir=WORKSPACE_DIR)
+        return self._tools
+    
+    @property
+    def memory(self):
+        """Persistent agent memory, loaded on first use"""
+        if self._memory is None:
+            self._memory = AgentMemory(agent_name=self.name, memory_dir=MEMORY_DIR)
+        return self._memory
         
     @abstractmethod
     async def initialize(self) -> bool:
@@ -119,112 +209,185 @@ class BaseAgent(ABC):
     async def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         pass
     
-    async def think(self, context: str, task: str = None) -> str:
+    def _build_prompt(self, context: str, task: str = None, shared_ctx: str = None) -> List[Dict[str, str]]:
         """
-        Use LLM to think about the current situation
+        Assemble the system + user messages for a think() call.
+        shared_ctx: pre-fetched shared memory context (fetched here when None).
         """
-        if not self.llm:
-            return "Thinking... (LLM not available)"
+        # Feature 9: Inject shared memory context
+        if shared_ctx is None:
+            shared_ctx = self.shared_memory.get_context_for_agent(self.name) if self.shared_memory else ""
+        
+        # Static prefix first, dynamic shared knowledge last, so the API's prefix cache can hit
+        system_prompt = self._static_system_prompt()
+        if shared_ctx:
+            # Shared knowledge gets whatever the static part leaves of the budget
+            room = (SYSTEM_PROMPT_TOKEN_BUDGET - self._static_prompt[2]) * CHARS_PER_TOKEN
+            if len(shared_ctx) > room:
+                shared_ctx = shared_ctx[:max(room, 0)]
+        if shared_ctx:
+            system_prompt = "".join((system_prompt, _SHARED_HEADER, shared_ctx))
+        
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": "".join((_USER_PREFIX, str(context), _USER_TASK, str(task), _USER_SUFFIX))}
+        ]
+    
+    def _static_system_prompt(self) -> str:
+        """Role, project context and tool docs; built once per agent (rebuilt if role_instruction changes)"""
+        if self._static_prompt is not None and self._static_prompt[0] == self.role_instruction:
+            return self._static_prompt[1]
+        role_context = f"\n\nYOUR ROLE INSTRUCTIONS:\n{self.role_instruction}" if self.role_instruction else ""
+        project_ctx = f"\n\nPROJECT CONTEXT:\n{self.project_context}" if self.project_context else ""
+        prompt = f"""You are the {self.name} of an advanced AI Trading System. 
+            Your role is detailed, professional, and proactive. Respond as if you are a real expert in your field.
+            {role_context}
+            {project_ctx}
             
-        try:
-            role_context = f"\n\nYOUR ROLE INSTRUCTIONS:\n{self.role_instruction}" if self.role_instruction else ""
-            project_ctx = f"\n\nPROJECT CONTEXT:\n{self.project_context}" if self.project_context else ""
+            You have access to the following TOOLS to perform actions.
+            IMPORTANT: To use a tool, you MUST use the following JSON format:
+            [JSON_CMD: {{"tool": "TOOL_NAME", "args": {{"key": "value"}}}}]
             
-            # Feature 9: Inject shared memory context
-            shared_ctx = ""
-            if self.shared_memory:
-                shared_ctx = self.shared_memory.get_context_for_agent(self.name)
-                if shared_ctx:
-                    shared_ctx = f"\n\nSHARED KNOWLEDGE FROM OTHER AGENTS:\n{shared_ctx}"
+            Available Tools:
+            1. WRITE_FILE: Create or overwrite a file.
+               Usage: 
+               [WRITE_FILE: filename.py]
+               def hello():
+                   print("World")
+               [END_WRITE_FILE]
+               IMPORTANT: Provide ONLY the code block when writing files. No conversational filler.
+               
+            2. READ_FILE: Read a file's content.
+               Usage: [JSON_CMD: {{"tool": "READ_FILE", "args": {{"target": "filename.py"}}}}]
+               
+            3. EXECUTE: Run a terminal command (python, dir, etc).
+               Usage: [JSON_CMD: {{"tool": "EXECUTE", "args": {{"target": "python filename.py"}}}}]
+               
+            4. LEARN: Store knowledge in long-term memory.
+               Usage: [JSON_CMD: {{"tool": "LEARN", "args": {{"key": "concept_name", "value": "description"}}}}]
+               
+            5. RECALL: Retrieve knowledge from long-term memory.
+               Usage: [JSON_CMD: {{"tool": "RECALL", "args": {{"key": "concept_name"}}}}]
             
-            prompt = [
-                {"role": "system", "content": f"""You are the {self.name} of an advanced AI Trading System. 
-                Your role is detailed, professional, and proactive. Respond as if you are a real expert in your field.
-                {role_context}
-                {project_ctx}
-                {shared_ctx}
-                
-                You have access to the following TOOLS to perform actions.
-                IMPORTANT: To use a tool, you MUST use the following JSON format:
-                [JSON_CMD: {{"tool": "TOOL_NAME", "args": {{"key": "value"}}}}]
-                
-                Available Tools:
-                1. WRITE_FILE: Create or overwrite a file.
-                   Usage: 
-                   [WRITE_FILE: filename.py]
-                   def hello():
-                       print("World")
-                   [END_WRITE_FILE]
-                   IMPORTANT: Provide ONLY the code block when writing files. No conversational filler.
-                   
-                2. READ_FILE: Read a file's content.
-                   Usage: [JSON_CMD: {{"tool": "READ_FILE", "args": {{"target": "filename.py"}}}}]
-                   
-                3. EXECUTE: Run a terminal command (python, dir, etc).
-                   Usage: [JSON_CMD: {{"tool": "EXECUTE", "args": {{"target": "python filename.py"}}}}]
-                   
-                4. LEARN: Store knowledge in long-term memory.
-                   Usage: [JSON_CMD: {{"tool": "LEARN", "args": {{"key": "concept_name", "value": "description"}}}}]
-                   
-                5. RECALL: Retrieve knowledge from long-term memory.
-                   Usage: [JSON_CMD: {{"tool": "RECALL", "args": {{"key": "concept_name"}}}}]
-                
-                6. GIT_COMMIT: Stage and commit all changes to git.
-                   Usage: [JSON_CMD: {{"tool": "GIT_COMMIT", "args": {{"message": "commit message"}}}}]
-                   
-                7. GIT_PUSH: Push commits to GitHub.
-                   Usage: [JSON_CMD: {{"tool": "GIT_PUSH", "args": {{}}}}]
-                   
-                8. GIT_STATUS: Check current git status.
-                   Usage: [JSON_CMD: {{"tool": "GIT_STATUS", "args": {{}}}}]
-                
-                CRITICAL: When assigned a task to "learn" or "remember" something, you MUST use the LEARN tool immediately.
-                When asked to "recall" or "check" if you know something, use the RECALL tool.
-                After completing significant work, use GIT_COMMIT to save your changes.
-                
-                When you need to perform an action, include the command in your response.
-                Reply in Vietnamese mainly, but use English for code and technical terms."""},
-                {"role": "user", "content": f"Here is the context: {context}\n\nTask/Question: {task}\n\nProvide a professional response."}
-            ]
+            6. GIT_COMMIT: Stage and commit all changes to git.
+               Usage: [JSON_CMD: {{"tool": "GIT_COMMIT", "args": {{"message": "commit message"}}}}]
+               
+            7. GIT_PUSH: Push commits to GitHub.
+               Usage: [JSON_CMD: {{"tool": "GIT_PUSH", "args": {{}}}}]
+               
+            8. GIT_STATUS: Check current git status.
+               Usage: [JSON_CMD: {{"tool": "GIT_STATUS", "args": {{}}}}]
+            
+            CRITICAL: When assigned a task to "learn" or "remember" something, you MUST use the LEARN tool immediately.
+            When asked to "recall" or "check" if you know something, use the RECALL tool.
+            After completing significant work, use GIT_COMMIT to save your changes.
             
-            response = self.llm.chat_completion(prompt)
+            When you need to perform an action, include the command in your response.
+            Reply in Vietnamese mainly, but use English for code and technical terms."""
+        self._static_prompt = (self.role_instruction, prompt, len(prompt) // CHARS_PER_TOKEN)
+        return prompt
+
+    async def think(self, context: str, task: str = None, cache: bool = True, pack: bool = False) -> str:
+        """
+        Use LLM to think about the current situation.
+        Pass cache=False for free-form chatter that should not reuse earlier replies,
+        pack=True for short-answer prompts (votes) that may share a batched call.
+        """
+        if not self.llm:
+            return "Thinking... (LLM not available)"
+            
+        try:
+            prompt = self._build_prompt(context, task)
+            response = await self.llm.abatched_chat(prompt, cache=cache, pack=pack)
             return response
         except Exception as e:
             self.logger.error(f"Thinking error: {e}")
             return f"Error thinking: {e}"
-            return f"Error thinking: {e}"
+    
+    async def _think_validated(self, context: str, task: str = None, shared_ctx: str = None,
+                               written: Dict[tuple, str] = None):
+        """
+        Streamed think() that handles WRITE_FILE blocks as they complete.
+        Returns (thought, error); on error the thought is the partial output up to the bad block.
+        written: filled with (filename, content) -> write result for blocks already saved mid-stream.
+        """
+        if not self.llm or not hasattr(self.llm, "chat_completion_stream_async"):
+            return await self.think(context, task), None
+        try:
+            prompt = self._build_prompt(context, task, shared_ctx)
+            validator = self._stream_block_handler({} if written is None else written)
+            return await self.llm.chat_completion_stream_async(prompt, validator=validator)
+        except Exception as e:
+            self.logger.error(f"Thinking error: {e}")
+            return f"Error thinking: {e}", None
+    
+    def _stream_block_handler(self, written: Dict[tuple, str]):
+        """
+        Stream validator: each newly completed WRITE_FILE block is checked once (the scan
+        resumes after the last completed block) and, if it compiles, written to disk
+        while generation continues. Returns an error for the first .py block that does not compile.
+        """
+        scanned = 0
+        
+        def on_chunk(text: str) -> Optional[str]:
+            nonlocal scanned
+            for _, scanned, filename, content in _iter_write_blocks(text, scanned):
+                filename, content = filename.strip(), content.strip()
+                if filename.endswith('.py'):
+                    try:
+                        compile(content, filename, 'exec')
+                    except SyntaxError as e:
+                        return f"SyntaxError in {filename} line {e.lineno}: {e.msg}"
+                if self.tools:
+                    written[(filename, content)] = self.tools.write_file(filename, content)
+            return None
+        
+        return on_chunk
 
-    async def act(self, thought: str) -> str:
+    async def act(self, thought: str, written: Dict[tuple, str] = None) -> str:
         """
         Parse thought for commands and execute them
         Format: [JSON_CMD: {"tool": "TOOL_NAME", "args": {...}}]
         Also supports legacy: [CMD: NAME key='val']
+        written: WRITE_FILE blocks already saved while streaming (not written again)
         """
         if not self.tools:
             return "Error: Tools not initialized."
+        # Most replies are prose: substring checks are far cheaper than the regex scan
+        if not thought or not any(marker in thought for marker in _ACTION_MARKERS):
+            return None
             
         results = []
+        block_matches, json_matches, legacy_matches = [], [], []
+        gaps, pos = [], 0
+        for start, end, filename, content in _iter_write_blocks(thought):
+            gaps.append((pos, start))
+            block_matches.append((filename, content))
+            pos = end
+        gaps.append((pos, len(thought)))
+        for gap_start, gap_end in gaps:
+            for m in _COMMAND_RE.finditer(thought, gap_start, gap_end):
+                if m.group('json') is not None:
+                    json_matches.append(m.group('json'))
+                else:
+                    legacy_matches.append((m.group('cmd'), m.group('args')))
+        
         # 0. Try CODE_BLOCK Format (Best for writing files)
         # [WRITE_FILE: filename.py]
         # content
         # [END_WRITE_FILE]
-        block_pattern = r"\[WRITE_FILE:\s*(.*?)\](.*?)\[END_WRITE_FILE\]"
-        block_matches = re.findall(block_pattern, thought, re.DOTALL)
-        
         for filename, content in block_matches:
             filename = filename.strip()
             content = content.strip()
-            result = self.tools.write_file(filename, content)
+            result = written.get((filename, content)) if written else None
+            if result is None:
+                result = self.tools.write_file(filename, content)
             results.append(f"BLOCK_CMD WRITE_FILE: {result}")
 
         # 1. Try JSON Format (Preferred for other tools)
-        # Regex to capture JSON content. \s* allows for newlines/spaces before the closing ]
-        json_pattern = r"\[JSON_CMD:\s*({.*?})\s*\]"
-        json_matches = re.findall(json_pattern, thought, re.DOTALL)
-        
         for json_str in json_matches:
             try:
-                cmd_data = json.loads(json_str)
+                cmd_data = _json_loads(json_str)
                 cmd_name = cmd_data.get('tool', '').upper()
                 args = cmd_data.get('args', {})
                 
@@ -235,13 +398,9 @@ class BaseAgent(ABC):
                 
         # 2. Try Legacy Regex Format (Fallback)
         if not results:
-            cmd_pattern = r"\[CMD:\s*(\w+)\s*(.*?)\]"
-            matches = re.findall(cmd_pattern, thought, re.DOTALL)
-            
-            for cmd_name, args_str in matches:
+            for cmd_name, args_str in legacy_matches:
                 cmd_name = cmd_name.upper()
-                arg_pattern = r"(\w+)=(?:'([^']*)'|\"([^\"]*)\")"
-                args_matches = re.findall(arg_pattern, args_str, re.DOTALL)
+                args_matches = _ARG_RE.findall(args_str)
                 
                 args = {}
                 for key, val_single, val_double in args_matches:
@@ -255,58 +414,86 @@ class BaseAgent(ABC):
 
     def _execute_tool(self, cmd_name: str, args: Dict[str, Any]) -> str:
         """Execute a single tool command"""
+        handler = self._TOOL_DISPATCH.get(cmd_name)
+        if handler is None:
+            return f"Error: Unknown command {cmd_name}"
         try:
-            if cmd_name == "WRITE_FILE":
-                filename = args.get('target') or args.get('filename')
-                content = args.get('content')
-                if filename and content:
-                    return self.tools.write_file(filename, content)
-                return "Error: Missing target or content."
-                    
-            elif cmd_name == "READ_FILE":
-                filename = args.get('target') or args.get('filename')
-                if filename:
-                    return self.tools.read_file(filename)
-                return "Error: Missing target."
-                    
-            elif cmd_name == "EXECUTE" or cmd_name == "RUN":
-                cmd = args.get('target') or args.get('command')
-                if cmd:
-                    return self.tools.run_command(cmd)
-                return "Error: Missing command."
-                
-            elif cmd_name == "LEARN":
-                key = args.get('key')
-                value = args.get('value')
-                if self.memory and key and value:
-                    return self.memory.remember_fact(key, value)
-                return "Error: Memory not initialized or missing key/value."
-                
-            elif cmd_name == "RECALL":
-                key = args.get('key')
-                if self.memory:
-                    if key:
-                        return self.memory.recall_fact(key)
-                    else:
-                        return self.memory.get_all_facts()
-                return "Error: Memory not initialized."
-                
-            elif cmd_name == "GIT_COMMIT":
-                message = args.get('message', 'Auto-commit by agent')
-                return self.tools.git_commit(message)
-                
-            elif cmd_name == "GIT_PUSH":
-                return self.tools.git_push()
-                
-            elif cmd_name == "GIT_STATUS":
-                return self.tools.git_status()
-                
-            else:
-                return f"Error: Unknown command {cmd_name}"
-                
+            return handler(self, args)
         except Exception as e:
             return f"Error executing {cmd_name}: {e}"
 
+    def _tool_write_file(self, args: Dict[str, Any]) -> str:
+        filename = args.get('target') or args.get('filename')
+        content = args.get('content')
+        if filename and content:
+            return self.tools.write_file(filename, content)
+        return "Error: Missing target or content."
+
+    def _tool_read_file(self, args: Dict[str, Any]) -> str:
+        filename = args.get('target') or args.get('filename')
+        if filename:
+            return self.tools.read_file(filename)
+        return "Error: Missing target."
+
+    def _tool_execute(self, args: Dict[str, Any]) -> str:
+        cmd = args.get('target') or args.get('command')
+        if cmd:
+            return self.tools.run_command(cmd)
+        return "Error: Missing command."
+
+    def _tool_learn(self, args: Dict[str, Any]) -> str:
+        key = args.get('key')
+        value = args.get('value')
+        if self.memory and key and value:
+            return self.memory.remember_fact(key, value)
+        return "Error: Memory not initialized or missing key/value."
+
+    def _tool_recall(self, args: Dict[str, Any]) -> str:
+        key = args.get('key')
+        if self.memory:
+            if key:
+                return self.memory.recall_fact(key)
+            else:
+                return self.memory.get_all_facts()
+        return "Error: Memory not initialized."
+
+    def _tool_git_commit(self, args: Dict[str, Any]) -> str:
+        message = args.get('message', 'Auto-commit by agent')
+        return self.tools.git_commit(message)
+
+    def _tool_git_push(self, args: Dict[str, Any]) -> str:
+        return self.tools.git_push()
+
+    def _tool_git_status(self, args: Dict[str, Any]) -> str:
+        return self.tools.git_status()
+
+    # Tool name -> handler (plain functions, called with self)
+    _TOOL_DISPATCH = MappingProxyType({
+        "WRITE_FILE": _tool_write_file,
+        "READ_FILE": _tool_read_file,
+        "EXECUTE": _tool_execute,
+        "RUN": _tool_execute,
+        "LEARN": _tool_learn,
+        "RECALL": _tool_recall,
+        "GIT_COMMIT": _tool_git_commit,
+        "GIT_PUSH": _tool_git_push,
+        "GIT_STATUS": _tool_git_status,
+    })
+
+    async def _gather_context(self, task_description: str):
+        """
+        Fetch shared-memory context and the first matching failure history
+        (by the task's first 3 words) concurrently. Returns (shared_ctx, failure_history).
+        """
+        async def none():
+            return ""
+        
+        shared_task = asyncio.to_thread(self.shared_memory.get_context_for_agent, self.name) if self.shared_memory else none()
+        fail_tasks = [asyncio.to_thread(self.memory.get_failure_history, kw)
+                      for kw in task_description.split()[:3]] if self.memory else []
+        shared_ctx, *failures = await asyncio.gather(shared_task, *fail_tasks)
+        return shared_ctx or "", next((f for f in failures if f), "")
+    
     async def execute_with_retry(self, task_description: str, max_rounds: int = 3) -> Dict[str, Any]:
         """
         Multi-round execution loop with self-correction.
@@ -315,16 +502,11 @@ class BaseAgent(ABC):
         last_error = None
         all_outputs = []
         
-        # Feature 11: Inject failure history
-        failure_context = ""
-        if self.memory:
-            keywords = task_description.split()[:3]
-            for kw in keywords:
-                fh = self.memory.get_failure_history(kw)
-                if fh:
-                    failure_context = f"\n\n{fh}"
-                    break
+        # Feature 9 + 11: shared knowledge and failure history, fetched concurrently once per task
+        shared_ctx, failure_history = await self._gather_context(task_description)
+        failure_context = f"\n\n{failure_history}" if failure_history else ""
         
+        previous_output = ""
         for round_num in range(1, max_rounds + 1):
             self.logger.info(f"{self.name}: Round {round_num}/{max_rounds} for: {task_description[:60]}...")
             
@@ -332,15 +514,25 @@ class BaseAgent(ABC):
             context = task_description + failure_context
             if last_error:
                 context += f"\n\nPREVIOUS ATTEMPT FAILED with error:\n{last_error}\nPlease fix the issue and try again."
+            if previous_output:
+                context += f"\n\nYOUR PREVIOUS OUTPUT (generation stopped at the error above). Keep what is correct and fix only the failing part:\n{previous_output[-3000:]}"
             
-            # Think
-            thought = await self.think(context, task_description)
+            # Think (streamed; completed file blocks are written while generation continues,
+            # and it stops early if a written .py block has a syntax error)
+            written = {}
+            thought, stream_error = await self._think_validated(context, task_description, shared_ctx, written)
+            if stream_error:
+                last_error = stream_error
+                previous_output = thought
+                self.logger.warning(f"{self.name}: Round {round_num} stopped early: {stream_error}")
+                continue
+            previous_output = ""
             if not thought or "Error thinking" in thought:
                 last_error = f"Thinking failed: {thought}"
                 continue
             
             # Act (write files, execute commands)
-            action_result = await self.act(thought)
+            action_result = await self.act(thought, written)
             if action_result:
                 all_outputs.append(action_result)
             
@@ -350,8 +542,11 @@ class BaseAgent(ABC):
                 self.logger.warning(f"{self.name}: Round {round_num} had errors, retrying...")
                 continue
             
+            # One readdir of workspace + repo root serves both file checks below
+            present = self._present_files() if self.tools else {}
+            
             # Auto-run any Python files that were written
-            code_run_result = await self._auto_run_code(action_result)
+            code_run_result = await self._auto_run_code(action_result, present)
             if code_run_result:
                 all_outputs.append(code_run_result)
                 if "Error" in code_run_result or "Traceback" in code_run_result:
@@ -360,7 +555,7 @@ class BaseAgent(ABC):
                     continue
             
             # Validate — check if expected files were created
-            validation = await self.validate_output(thought, action_result)
+            validation = await self.validate_output(thought, action_result, present)
             if validation["valid"]:
                 return {
                     "status": "success",
@@ -384,75 +579,84 @@ class BaseAgent(ABC):
             "rounds": max_rounds
         }
     
-    async def validate_output(self, thought: str, action_result: str) -> Dict:
-        """Verify that expected output files were actually created"""
-        import re
-        
+    def _present_files(self) -> Dict[str, str]:
+        """Basename -> path for entries in the repo root and workspace (workspace wins)"""
+        present = {}
+        for directory in (self.tools.repo_dir, self.tools.workspace_dir):
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        present[entry.name] = entry.path
+            except OSError:
+                continue
+        return present
+    
+    async def validate_output(self, thought: str, action_result: str, present: Dict[str, str] = None) -> Dict:
+        """
+        Verify that expected output files were actually created.
+        present: snapshot from _present_files() (taken here when None).
+        """
         # Extract filenames mentioned in thought
-        file_patterns = re.findall(r'[\w_]+\.(?:py|csv|json|txt|yaml|md)', thought or "")
+        file_patterns = _FILE_RE.findall(thought or "")
         
         if not file_patterns or not self.tools:
             return {"valid": True, "reason": "No files to validate"}
         
-        missing = []
-        for filename in set(file_patterns):
-            filepath = self.tools._get_safe_path(filename)
-            if not os.path.exists(filepath):
-                # Also check repo root
-                root_path = os.path.join(self.tools.repo_dir, filename)
-                if not os.path.exists(root_path):
-                    missing.append(filename)
+        if present is None:
+            present = self._present_files()
+        # Workspace or repo root
+        missing = [filename for filename in set(file_patterns) if filename not in present]
         
         if missing:
             return {"valid": False, "reason": f"Expected files not found: {', '.join(missing)}"}
         return {"valid": True, "reason": "All expected files exist"}
     
-    async def _auto_run_code(self, action_result: str) -> Optional[str]:
+    async def _auto_run_code(self, action_result: str, present: Dict[str, str] = None) -> Optional[str]:
         """
         Feature 1: Auto-run Python files that were just written.
         Returns execution output or None if no files to run.
+        present: snapshot from _present_files() (taken here when None).
         """
         if not action_result or not self.tools:
             return None
         
         # Extract filenames from WRITE_FILE results
-        written_files = re.findall(r'WRITE_FILE.*?(?:workspace[/\\])?(\w+\.py)', action_result)
+        written_files = _WRITTEN_RE.findall(action_result)
         if not written_files:
             return None
+        if present is None:
+            present = self._present_files()
         
-        results = []
-        for filename in set(written_files):
-            filepath = self.tools._get_safe_path(filename)
-            if not os.path.exists(filepath):
-                # Check repo root too
-                filepath = os.path.join(self.tools.repo_dir, filename)
-            
-            if not os.path.exists(filepath):
-                continue
+        async def run_one(filename):
+            # Workspace first, then repo root
+            filepath = present.get(filename)
+            if filepath is None:
+                return None
             
             self.logger.info(f"{self.name}: Auto-running {filename}...")
             try:
-                import subprocess
-                result = subprocess.run(
-                    ["python", filepath],
-                    capture_output=True, text=True, timeout=30,
-                    cwd=self.tools.workspace_dir if self.tools else None
-                )
+                try:
+                    returncode, stdout, stderr = await _RUNNER_POOL.run(
+                        filepath, cwd=self.tools.workspace_dir, timeout=30
+                    )
+                except asyncio.TimeoutError:
+                    return f"⏰ {filename} TIMEOUT (30s)"
                 
-                output = result.stdout[:1000] if result.stdout else ""
-                errors = result.stderr[:1000] if result.stderr else ""
+                output = stdout[:1000]
+                errors = stderr[:1000]
                 
-                if result.returncode != 0:
-                    results.append(f"❌ {filename} FAILED (exit {result.returncode}):\n{errors}")
+                if returncode != 0:
                     self.logger.warning(f"{self.name}: {filename} execution failed")
-                else:
-                    results.append(f"✅ {filename} OK: {output[:200]}")
-                    self.logger.info(f"{self.name}: {filename} executed successfully")
+                    return f"❌ {filename} FAILED (exit {returncode}):\n{errors}"
+                self.logger.info(f"{self.name}: {filename} executed successfully")
+                return f"✅ {filename} OK: {output[:200]}"
                     
-            except subprocess.TimeoutExpired:
-                results.append(f"⏰ {filename} TIMEOUT (30s)")
             except Exception as e:
-                results.append(f"❌ {filename} Error: {str(e)[:200]}")
+                return f"❌ {filename} Error: {str(e)[:200]}"
+        
+        # Written files are independent scripts: run them concurrently
+        outcomes = await asyncio.gather(*(run_one(f) for f in dict.fromkeys(written_files)))
+        results = [r for r in outcomes if r]
         
         return "\n".join(results) if results else None
     
@@ -472,8 +676,10 @@ class BaseAgent(ABC):
             if not os.path.exists(filepath):
                 return {"reviewed": False, "reason": f"File not found: {filepath}"}
             
+            # Only the head of the file goes into the prompt; don't read past it
             with open(filepath, 'r', encoding='utf-8') as f:
-                code = f.read()
+                code = f.read(REVIEW_MAX_CHARS)
+                code_length = os.fstat(f.fileno()).st_size
         except Exception as e:
             return {"reviewed": False, "reason": str(e)}
         
@@ -487,17 +693,17 @@ Review the code and provide:
 3. SUGGESTIONS for improvement
 4. SECURITY concerns
 Be concise. Reply in Vietnamese."""},
-            {"role": "user", "content": f"Review this file ({filename}):\n```python\n{code[:3000]}\n```"}
+            {"role": "user", "content": f"Review this file ({filename}):\n```python\n{code}\n```"}
         ]
         
         try:
-            review = self.llm.chat_completion(review_prompt)
+            review = await self.llm.chat_completion_async(review_prompt)
             self.logger.info(f"{self.name}: Code review completed for {filename}")
             return {
                 "reviewed": True,
                 "file": filename,
                 "review": review,
-                "code_length": len(code)
+                "code_length": code_length
             }
         except Exception as e:
             return {"reviewed": False, "reason": str(e)}
@@ -506,7 +712,7 @@ Be concise. Reply in Vietnamese."""},
     
     def send_message(self, to_agent: str, message: str, msg_type: str = "message"):
         """Send a direct message to another agent"""
-        to_id = self.agent_ids.get(to_agent, to_agent)
+        to_id = self.AGENT_IDS.get(to_agent, to_agent)
         try:
             log_agent_message(
                 from_agent=self.my_id,
@@ -535,7 +741,7 @@ Be concise. Reply in Vietnamese."""},
                 
             log_agent_message(
                 from_agent=self.my_id,
-                to_agent=self.agent_ids["project_manager"],
+                to_agent=self.AGENT_IDS["project_manager"],
                 message=activity,
                 message_type=msg_type
             )
@@ -544,5 +750,3 @@ Be concise. Reply in Vietnamese."""},
             
     async def receive_message(self, from_agent: str, message: str):
         self.conversation_history.append(f"{from_agent}: {message}")
-        if len(self.conversation_history) > 10:
-            self.conversation_history = self.conversation_history[-10:]
@@ -8,22 +8,22 @@ from typing import Dict, Any, List
 import logging
 from datetime import datetime
 import os
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 try:
     import yfinance as yf
 except ImportError:
     yf = None
 
-from .base_agent import BaseAgent
+from .base_agent import BaseAgent, REPO_ROOT
 
 
 class DataScientist(BaseAgent):
     """Data Scientist Agent for ML Trading Bot"""
     
-    def __init__(self, config: Dict[str, Any], api_key: str = None):
-        super().__init__(config, "data_scientist", api_key)
-        
-        self.role_instruction = """
+    __slots__ = ('data_dir',)
+    
+    ROLE_INSTRUCTION = """
 You are the Data Scientist of the ML Trading Bot team. Your expertise covers:
 
 1. DATA PIPELINE:
@@ -51,14 +51,24 @@ You are the Data Scientist of the ML Trading Bot team. Your expertise covers:
 COMMUNICATION: When reporting results, always include specific numbers (accuracy %, row counts, date ranges).
 Always collaborate with Quant Analyst for feature validation and Engineer for data pipeline integration.
 """
+    
+    # Dedicated threads for blocking yfinance downloads, shared by all instances
+    _download_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='yf')
+    # data/raw is a fixed path, so it only needs creating once per process
+    _data_dir_initialized: bool = False
+    
+    def __init__(self, config: Dict[str, Any], api_key: str = None):
+        super().__init__(config, "data_scientist", api_key)
         
         self.status['performance'] = {
             'models_trained': 0,
             'features_engineered': 0,
             'data_processed_gb': 0
         }
-        self.data_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'raw')
-        os.makedirs(self.data_dir, exist_ok=True)
+        self.data_dir = str(REPO_ROOT / 'data' / 'raw')
+        if not DataScientist._data_dir_initialized:
+            os.makedirs(self.data_dir, exist_ok=True)
+            DataScientist._data_dir_initialized = True
     
     async def initialize(self) -> bool:
         """Initialize Data Scientist agent"""
@@ -89,18 +99,21 @@ Always collaborate with Quant Analyst for feature validation and Engineer for da
         try:
             await self.log_activity(f"Starting download for {symbol} ({period})...")
             
-            # Run blocking call in executor
-            loop = asyncio.get_event_loop()
-            df = await loop.run_in_executor(None, lambda: yf.download(symbol, period=period, interval=interval, progress=False))
+            filename = f"{symbol}_{datetime.now().strftime('%Y%m%d')}.csv"
+            filepath = os.path.join(self.data_dir, filename)
+            
+            def download_and_save():
+                df = yf.download(symbol, period=period, interval=interval, progress=False)
+                if not df.empty:
+                    df.to_csv(filepath)  # Save to CSV
+                return df
+            
+            # Download and write share one executor hop; neither blocks the event loop
+            df = await asyncio.get_running_loop().run_in_executor(self._download_pool, download_and_save)
             
             if df.empty:
                 return f"No data found for {symbol}."
             
-            # Save to CSV
-            filename = f"{symbol}_{datetime.now().strftime('%Y%m%d')}.csv"
-            filepath = os.path.join(self.data_dir, filename)
-            df.to_csv(filepath)
-            
             msg = f"Successfully downloaded {len(df)} rows for {symbol}. Saved to {filename}."
             await self.log_activity(msg)
             return msg
@@ -110,6 +123,10 @@ Always collaborate with Quant Analyst for feature validation and Engineer for da
             self.logger.error(error_msg)
             return error_msg
     
+    async def download_many(self, symbols: List[str], period: str = "1mo", interval: str = "1d") -> List[str]:
+        """Download several symbols concurrently on the download pool"""
+        return await asyncio.gather(*(self.download_market_data(s, period, interval) for s in symbols))
+    
     async def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute data science task"""
         task_type = task.get('type', 'unknown')
@@ -130,14 +147,19 @@ Always collaborate with Quant Analyst for feature validation and Engineer for da
                 
                 if tool_result:
                     # If action taken, think again with result
-                    final_response = await self.think(f"I performed actions.", f"Tool Output: {tool_result}. Now summarize what I did.")
+                    summarize = self.think(f"I performed actions.", f"Tool Output: {tool_result}. Now summarize what I did.")
+                    # Special handling for memory test to ensure double-check,
+                    # run alongside the summary call instead of after it
+                    if task_type == 'memory_test' and 'LEARN' in tool_result:
+                        final_response, recall_check = await asyncio.gather(
+                            summarize,
+                            self.act(f"[JSON_CMD: {{'tool': 'RECALL', 'args': {{'key': 'project_start_date'}}}}]")  # Basic check
+                        )
+                    else:
+                        final_response = await summarize
                     result_str = f"{initial_thought}\n\n--> ACTION OUTPUT:\n{tool_result}\n\n--> FINAL:\n{final_response}"
                 else:
                     result_str = initial_thought
-                    
-                # Special handling for memory test to ensure double-check
-                if task_type == 'memory_test' and 'LEARN' in tool_result:
-                     recall_check = await self.act(f"[JSON_CMD: {{'tool': 'RECALL', 'args': {{'key': 'project_start_date'}}}}]") # Basic check
             
             await self.log_activity(f"Task {task_type} completed.")
             return {'status': 'success', 'output': result_str}
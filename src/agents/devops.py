@@ -14,10 +14,9 @@ from .base_agent import BaseAgent
 class DevOps(BaseAgent):
     """DevOps Agent for ML Trading Bot"""
     
-    def __init__(self, config: Dict[str, Any], api_key: str = None):
-        super().__init__(config, "devops", api_key)
-        
-        self.role_instruction = """
+    __slots__ = ()
+    
+    ROLE_INSTRUCTION = """
 You are the DevOps Engineer of the ML Trading Bot team. Your expertise covers:
 
 1. SERVER MONITORING:
@@ -60,6 +59,9 @@ COMMUNICATION: Always report with specific metrics (uptime %, latency ms, error
 Collaborate with Engineer for architecture decisions and all agents for resource requirements.
 """
     
+    def __init__(self, config: Dict[str, Any], api_key: str = None):
+        super().__init__(config, "devops", api_key)
+    
     async def initialize(self) -> bool:
         """Initialize DevOps agent"""
         try:
@@ -14,10 +14,9 @@ from .base_agent import BaseAgent
 class Engineer(BaseAgent):
     """Engineer Agent for ML Trading Bot"""
     
-    def __init__(self, config: Dict[str, Any], api_key: str = None):
-        super().__init__(config, "engineer", api_key)
-        
-        self.role_instruction = """
+    __slots__ = ()
+    
+    ROLE_INSTRUCTION = """
 You are the Software Engineer of the ML Trading Bot team. Your expertise covers:
 
 1. SYSTEM ARCHITECTURE:
@@ -54,6 +53,9 @@ COMMUNICATION: When proposing code changes, always explain the "why" not just th
 Collaborate with DevOps for deployment and Data Scientist for pipeline architecture.
 """
     
+    def __init__(self, config: Dict[str, Any], api_key: str = None):
+        super().__init__(config, "engineer", api_key)
+    
     async def initialize(self) -> bool:
         """Initialize Engineer agent"""
         try:
@@ -14,10 +14,9 @@ from .base_agent import BaseAgent
 class QuantAnalyst(BaseAgent):
     """Quant Analyst Agent for ML Trading Bot"""
     
-    def __init__(self, config: Dict[str, Any], api_key: str = None):
-        super().__init__(config, "quant_analyst", api_key)
-        
-        self.role_instruction = """
+    __slots__ = ()
+    
+    ROLE_INSTRUCTION = """
 You are the Quant Analyst of the ML Trading Bot team. Your expertise covers:
 
 1. TRADING STRATEGY DESIGN:
@@ -53,6 +52,9 @@ You are the Quant Analyst of the ML Trading Bot team. Your expertise covers:
 COMMUNICATION: Always express opinions with data backing. Share risk metrics with every strategy proposal.
 Collaborate with Data Scientist for feature signals and Engineer for execution logic.
 """
+    
+    def __init__(self, config: Dict[str, Any], api_key: str = None):
+        super().__init__(config, "quant_analyst", api_key)
         
         self.status['performance'] = {
             'strategies_developed': 0,
@@ -4,9 +4,12 @@ Risk Manager Agent — Feature 14
 position sizing, max drawdown limits, correlation analysis, portfolio risk.
 """
 
+import re
+import json
 import logging
 from typing import Dict, Any
-from agents.base_agent import BaseAgent
+from .base_agent import BaseAgent
+from ..utils.kelly import parse_kelly_inputs, position_size
 
 logger = logging.getLogger(__name__)
 
@@ -14,10 +17,9 @@ logger = logging.getLogger(__name__)
 class RiskManagerAgent(BaseAgent):
     """Risk Manager — guards the trading system against excessive risk"""
     
-    def __init__(self, config: Dict[str, Any], api_key: str = None):
-        super().__init__(config, "risk_manager", api_key)
-        
-        self.role_instruction = """You are the RISK MANAGER of a professional trading operation.
+    __slots__ = ('risk_params', '_risk_params_text')
+    
+    ROLE_INSTRUCTION = """You are the RISK MANAGER of a professional trading operation.
 Your responsibilities:
 1. Position Sizing: Calculate optimal position sizes based on Kelly criterion or fixed fractional
 2. Drawdown Limits: Monitor and enforce maximum drawdown thresholds (e.g., 15% max)
@@ -37,6 +39,16 @@ When reviewing strategies, ALWAYS check:
 - How does it behave in crashes?
 
 Reply in Vietnamese."""
+    
+    # Task type by title keyword (substring, case-insensitive), checked in priority order
+    _TASK_TYPE_PATTERNS = (
+        ("review", re.compile(r"review|assess|evaluate", re.I)),
+        ("sizing", re.compile(r"size|position|allocat", re.I)),
+        ("monitor", re.compile(r"monitor|check|alert", re.I)),
+    )
+    
+    def __init__(self, config: Dict[str, Any], api_key: str = None):
+        super().__init__(config, "risk_manager", api_key)
 
         # Default risk parameters
         self.risk_params = {
@@ -46,6 +58,8 @@ Reply in Vietnamese."""
             "required_sharpe": 0.5,           # Min Sharpe ratio for strategies
             "max_loss_per_trade_pct": 2.0,    # Max 2% loss per trade
         }
+        # Serialized once for prompts and memory (JSON, so readers can json.loads it)
+        self._risk_params_text = json.dumps(self.risk_params, indent=2)
     
     async def initialize(self) -> bool:
         """Initialize risk manager with current system state"""
@@ -54,13 +68,13 @@ Reply in Vietnamese."""
         if self.llm:
             init_thought = await self.think(
                 "You are initializing as the Risk Manager. Review current risk parameters and prepare for monitoring.",
-                f"Risk Parameters: {self.risk_params}\n"
+                f"Risk Parameters: {self._risk_params_text}\n"
                 f"Set up risk monitoring for the trading system."
             )
             self.logger.info(f"{self.name}: Risk Assessment: {init_thought[:200]}...")
         
         if self.memory:
-            self.memory.remember_fact("risk_params", str(self.risk_params))
+            self.memory.remember_fact("risk_params", self._risk_params_text)
         
         self.is_initialized = True
         self.logger.info(f"{self.name}: Risk Manager agent initialized successfully")
@@ -87,13 +101,9 @@ Reply in Vietnamese."""
             return {"status": "error", "error": str(e)}
     
     def _classify_risk_task(self, title: str) -> str:
-        title_lower = title.lower()
-        if any(w in title_lower for w in ["review", "assess", "evaluate"]):
-            return "review"
-        elif any(w in title_lower for w in ["size", "position", "allocat"]):
-            return "sizing"
-        elif any(w in title_lower for w in ["monitor", "check", "alert"]):
-            return "monitor"
+        for task_type, pattern in self._TASK_TYPE_PATTERNS:
+            if pattern.search(title):
+                return task_type
         return "general"
     
     async def _review_strategy_risk(self, task: Dict) -> Dict:
@@ -103,7 +113,7 @@ Reply in Vietnamese."""
 {task['description']}
 
 Check against these risk parameters:
-{self.risk_params}
+{self._risk_params_text}
 
 Evaluate: stop-loss, drawdown, position sizing, worst-case scenario.
 Write a risk report to workspace/risk_report.py""",
@@ -120,6 +130,24 @@ Write a risk report to workspace/risk_report.py""",
         return result
     
     async def _calculate_position_size(self, task: Dict) -> Dict:
+        # Closed-form Kelly when the task states win rate and average win/loss
+        inputs = parse_kelly_inputs(task.get("description", ""))
+        if inputs:
+            sizing = position_size(
+                inputs["p"], inputs["a"], inputs["b"], inputs.get("capital"),
+                max_position_pct=self.risk_params["max_position_pct"],
+                max_loss_pct=self.risk_params["max_loss_per_trade_pct"]
+            )
+            output = (
+                f"Kelly fraction: {sizing['kelly_fraction']:.2%} "
+                f"(p={inputs['p']:.2%}, avg win={inputs['b']:.2%}, avg loss={inputs['a']:.2%})\n"
+                f"Position size after risk caps: {sizing['fraction']:.2%} of capital"
+            )
+            if "position" in sizing:
+                output += f" = {sizing['position']:,.2f} (max loss {sizing['max_loss']:,.2f})"
+            self.logger.info(f"{self.name}: {output}")
+            return {"status": "success", "output": output, "position_sizing": sizing}
+        
         return await self.execute_with_retry(
             f"""Calculate optimal position sizes:
 {task['description']}
@@ -144,6 +172,9 @@ Check:
 3. Correlation between active strategies
 4. Stop-loss placement
 
+For correlation, use src/utils/risk_stats.py (add '..' to sys.path): RollingCov.update() per new
+return row instead of recomputing over the whole window, cora()/nancora() for a one-off matrix.
+
 Write monitor script to workspace/risk_monitor.py""",
             max_rounds=3
         )
@@ -0,0 +1 @@
+"""Shared utilities: LLM client, memory, tools, monitoring"""
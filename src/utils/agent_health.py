@@ -11,6 +11,14 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Per-agent locks are striped over this many mutexes (power of two)
+LOCK_STRIPES = 16
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    """Format a stored time.time() value, only when it is reported"""
+    return datetime.fromtimestamp(ts).isoformat() if ts is not None else None
+
 
 class AgentHealthMonitor:
     """Monitors agent health: tracks task times, token usage, error rates"""
@@ -21,15 +29,31 @@ class AgentHealthMonitor:
         self.max_task_time = max_task_time_seconds  # 5 min per task default
         self.max_errors = max_consecutive_errors
         self.max_tokens = max_tokens_per_task
-        self.lock = threading.Lock()
+        # Guards the registry itself; metric updates take only the agent's stripe lock
+        self.lock = threading.RLock()
+        self._stripes = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self._agent_locks: Dict[str, threading.Lock] = {}
         
         # Per-agent metrics
         self.agents: Dict[str, Dict] = {}
     
-    def register_agent(self, agent_name: str):
-        """Register an agent for monitoring"""
+    def _snapshot(self) -> List[tuple]:
+        """(name, metrics, stripe lock) for every agent, copied under the registry lock"""
         with self.lock:
-            self.agents[agent_name] = {
+            return [(name, agent, self._agent_locks[name]) for name, agent in self.agents.items()]
+    
+    def register_agent(self, agent_name: str, reset: bool = True) -> Dict:
+        """
+        Register an agent for monitoring and return its metrics.
+        reset=False keeps an already registered agent's metrics (atomic check-and-insert).
+        """
+        with self.lock:
+            agent = self.agents.get(agent_name)
+            if agent is not None and not reset:
+                return agent
+            # Lock first: mutators look the agent up without the registry lock
+            self._agent_locks[agent_name] = self._stripes[hash(agent_name) & (LOCK_STRIPES - 1)]
+            agent = self.agents[agent_name] = {
                 "status": "idle",
                 "task_start": None,
                 "current_task": None,
@@ -39,37 +63,38 @@ class AgentHealthMonitor:
                 "total_time": 0.0,
                 "avg_task_time": 0.0,
                 "token_usage": 0,
-                "last_activity": datetime.now().isoformat(),
+                "last_activity_ts": time.time(),
                 "warnings": [],
                 "restarts": 0
             }
+            return agent
     
     def task_started(self, agent_name: str, task_title: str):
         """Mark that an agent has started a task"""
-        with self.lock:
-            if agent_name not in self.agents:
-                self.register_agent(agent_name)
-            
-            self.agents[agent_name]["status"] = "working"
-            self.agents[agent_name]["task_start"] = time.time()
-            self.agents[agent_name]["current_task"] = task_title
-            self.agents[agent_name]["last_activity"] = datetime.now().isoformat()
+        agent = self.agents.get(agent_name) or self.register_agent(agent_name, reset=False)
+        with self._agent_locks[agent_name]:
+            now = time.time()
+            agent["status"] = "working"
+            agent["task_start"] = now
+            agent["current_task"] = task_title
+            agent["last_activity_ts"] = now
     
     def task_completed(self, agent_name: str, success: bool = True, tokens_used: int = 0):
         """Mark that an agent has completed a task"""
-        with self.lock:
-            if agent_name not in self.agents:
-                return
-            
-            agent = self.agents[agent_name]
-            elapsed = time.time() - (agent["task_start"] or time.time())
+        agent = self.agents.get(agent_name)
+        if agent is None:
+            return
+        
+        with self._agent_locks[agent_name]:
+            now = time.time()
+            elapsed = now - (agent["task_start"] or now)
             
             agent["status"] = "idle"
             agent["current_task"] = None
             agent["task_start"] = None
             agent["token_usage"] += tokens_used
             agent["total_time"] += elapsed
-            agent["last_activity"] = datetime.now().isoformat()
+            agent["last_activity_ts"] = now
             
             if success:
                 agent["tasks_completed"] += 1
@@ -84,12 +109,16 @@ class AgentHealthMonitor:
     def check_health(self) -> List[Dict]:
         """Check all agents for health issues. Returns list of warnings."""
         warnings = []
+        # Thresholds resolved once per sweep, not per agent
+        now = time.time()
+        token_limit = self.max_tokens * 0.8
         
-        with self.lock:
-            for name, agent in self.agents.items():
+        for name, agent, lock in self._snapshot():
+            with lock:
                 # Check if stuck (task running too long)
-                if agent["status"] == "working" and agent["task_start"]:
-                    elapsed = time.time() - agent["task_start"]
+                task_start = agent["task_start"]
+                if task_start and agent["status"] == "working":
+                    elapsed = now - task_start
                     if elapsed > self.max_task_time:
                         warnings.append({
                             "agent": name,
@@ -108,7 +137,7 @@ class AgentHealthMonitor:
                     })
                 
                 # Check token usage (warning if approaching limit)
-                if agent["token_usage"] > self.max_tokens * 0.8:
+                if agent["token_usage"] > token_limit:
                     warnings.append({
                         "agent": name,
                         "type": "high_token_usage",
@@ -120,28 +149,34 @@ class AgentHealthMonitor:
     
     def get_status_all(self) -> Dict:
         """Get health status of all agents"""
-        with self.lock:
-            return {
-                name: {
+        status = {}
+        for name, a, lock in self._snapshot():
+            with lock:
+                status[name] = {
                     "status": a["status"],
                     "tasks_done": a["tasks_completed"],
                     "tasks_failed": a["tasks_failed"],
                     "avg_time": round(a["avg_task_time"], 1),
                     "tokens": a["token_usage"],
                     "errors_streak": a["consecutive_errors"],
-                    "restarts": a["restarts"]
+                    "restarts": a["restarts"],
+                    "last_activity": a["last_activity_ts"]
                 }
-                for name, a in self.agents.items()
-            }
+        # Formatting happens outside the locks
+        for s in status.values():
+            s["last_activity"] = _iso(s["last_activity"])
+        return status
     
     def mark_restart(self, agent_name: str):
         """Record an agent restart"""
-        with self.lock:
-            if agent_name in self.agents:
-                self.agents[agent_name]["restarts"] += 1
-                self.agents[agent_name]["consecutive_errors"] = 0
-                self.agents[agent_name]["status"] = "restarting"
-                self.agents[agent_name]["last_activity"] = datetime.now().isoformat()
+        agent = self.agents.get(agent_name)
+        if agent is None:
+            return
+        with self._agent_locks[agent_name]:
+            agent["restarts"] += 1
+            agent["consecutive_errors"] = 0
+            agent["status"] = "restarting"
+            agent["last_activity_ts"] = time.time()
     
     def get_summary_text(self) -> str:
         """Formatted health summary"""
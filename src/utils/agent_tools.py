@@ -4,19 +4,31 @@ Provides capabilities for agents to interact with the file system and terminal.
 """
 
 import os
+import shlex
 import subprocess
 import logging
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# Programs run_command may start (matched on the executable's name, e.g. python3)
+ALLOWED_COMMANDS = ("python", "dir", "ls", "pip", "git")
+
+# Buffer for workspace file I/O
+IO_BUFFER_SIZE = 64 * 1024
+
+# Workspace dirs already created by this process
+_ensured_dirs = set()
+
 class AgentTools:
     """Collection of tools for autonomous agents"""
     
     def __init__(self, workspace_dir: str):
         self.workspace_dir = workspace_dir
         self.repo_dir = os.path.abspath(os.path.join(workspace_dir, '..'))
-        os.makedirs(self.workspace_dir, exist_ok=True)
+        if self.workspace_dir not in _ensured_dirs:
+            os.makedirs(self.workspace_dir, exist_ok=True)
+            _ensured_dirs.add(self.workspace_dir)
         
     def _get_safe_path(self, filename: str) -> str:
         """Ensure file access is restricted to workspace"""
@@ -24,21 +36,22 @@ class AgentTools:
         filename = os.path.basename(filename) 
         return os.path.join(self.workspace_dir, filename)
 
-    def write_file(self, filename: str, content: str) -> str:
+    def write_file(self, filename: str, content: Union[str, bytes]) -> str:
         """
         Write content to a file in the workspace
         
         Args:
             filename: Name of the file
-            content: Content to write
+            content: Content to write (str is UTF-8 encoded, bytes written as-is)
             
         Returns:
             Success message or error
         """
         try:
             filepath = self._get_safe_path(filename)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+            data = content if isinstance(content, bytes) else content.encode('utf-8')
+            with open(filepath, 'wb', buffering=IO_BUFFER_SIZE) as f:
+                f.write(data)
             return f"Successfully wrote to {filename}"
         except Exception as e:
             return f"Error writing file: {e}"
@@ -58,14 +71,14 @@ class AgentTools:
             if not os.path.exists(filepath):
                 return f"Error: File {filename} does not exist"
                 
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return f.read()
+            with open(filepath, 'rb', buffering=IO_BUFFER_SIZE) as f:
+                return f.read().decode('utf-8')
         except Exception as e:
             return f"Error reading file: {e}"
             
     def run_command(self, command: str) -> str:
         """
-        Run a shell command
+        Run a whitelisted command (argv split with shlex, no shell)
         
         Args:
             command: Command string (e.g., 'python script.py')
@@ -73,9 +86,14 @@ class AgentTools:
         Returns:
             Combined stdout/stderr output
         """
+        # Split like a shell would, but never hand the string to one
+        try:
+            argv = shlex.split(command, posix=os.name != 'nt')
+        except ValueError as e:
+            return f"Error: Could not parse command: {e}"
+        
         # Security: Whitelist allowed commands
-        allowed_cmds = ["python", "dir", "ls", "pip", "git"]
-        if not any(command.strip().startswith(cmd) for cmd in allowed_cmds):
+        if not argv or not argv[0].startswith(ALLOWED_COMMANDS):
             return "Error: Command not allowed. Only python, dir, ls, pip, git are permitted."
         
         # Security: Block dangerous patterns
@@ -84,13 +102,16 @@ class AgentTools:
         for pattern in blocked_patterns:
             if pattern in cmd_lower:
                 return f"Error: Blocked pattern '{pattern}' detected in command."
+        
+        # 'dir' is a cmd.exe builtin with no executable behind it
+        if os.name == 'nt' and argv[0].lower() == 'dir':
+            argv = ['cmd', '/c'] + argv
             
         try:
             # Run in workspace dir
             result = subprocess.run(
-                command,
+                argv,
                 cwd=self.workspace_dir,
-                shell=True,
                 capture_output=True,
                 text=True,
                 timeout=30
@@ -101,6 +122,8 @@ class AgentTools:
             return output if output.strip() else "Command executed with no output."
         except subprocess.TimeoutExpired:
             return "Error: Command timed out."
+        except FileNotFoundError:
+            return f"Error: Command not found: {argv[0]}"
         except Exception as e:
             return f"Error running command: {e}"
 
@@ -108,8 +131,8 @@ class AgentTools:
         """Check git status of the repo"""
         try:
             result = subprocess.run(
-                "git status --short",
-                cwd=self.repo_dir, shell=True,
+                ["git", "status", "--short"],
+                cwd=self.repo_dir,
                 capture_output=True, text=True, timeout=10
             )
             return result.stdout.strip() or "Working tree clean."
@@ -119,10 +142,11 @@ class AgentTools:
     def git_commit(self, message: str) -> str:
         """Stage all changes and commit"""
         try:
-            subprocess.run("git add -A", cwd=self.repo_dir, shell=True, capture_output=True, timeout=10)
+            subprocess.run(["git", "add", "-A"], cwd=self.repo_dir, capture_output=True, timeout=10)
+            # argv form: no shell fork, and multi-line messages need no quoting
             result = subprocess.run(
-                f'git commit -m "{message}"',
-                cwd=self.repo_dir, shell=True,
+                ["git", "commit", "-m", message],
+                cwd=self.repo_dir,
                 capture_output=True, text=True, timeout=10
             )
             output = result.stdout + result.stderr
@@ -134,8 +158,8 @@ class AgentTools:
         """Push commits to origin/main"""
         try:
             result = subprocess.run(
-                "git push origin main",
-                cwd=self.repo_dir, shell=True,
+                ["git", "push", "origin", "main"],
+                cwd=self.repo_dir,
                 capture_output=True, text=True, timeout=30
             )
             output = result.stdout + result.stderr
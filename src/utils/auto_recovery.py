@@ -5,12 +5,23 @@ Saves checkpoint after each task. On crash, resumes from last checkpoint.
 
 import os
 import json
+import time
+import atexit
 import logging
+import threading
 from datetime import datetime
 from typing import Dict, Optional, List
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Checkpoint writes are coalesced: one write per burst of state changes
+SAVE_DEBOUNCE_SEC = 0.5
+
 
 class AutoRecovery:
     """Checkpoint-based recovery system for autonomous pipeline"""
@@ -18,12 +29,23 @@ class AutoRecovery:
     def __init__(self, checkpoint_file: str = "checkpoint.json"):
         self.checkpoint_file = checkpoint_file
         self.state = self._load()
+        self._dirty = threading.Event()
+        # Mutators change self.state under _state_lock; flush() serializes a snapshot under it.
+        # Never acquire _write_lock while holding _state_lock.
+        self._state_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._flusher = None
+        atexit.register(self.flush)
     
     def _load(self) -> Dict:
         try:
             if os.path.exists(self.checkpoint_file):
-                with open(self.checkpoint_file, 'r') as f:
-                    data = json.load(f)
+                if orjson:
+                    with open(self.checkpoint_file, 'rb') as f:
+                        data = orjson.loads(f.read())
+                else:
+                    with open(self.checkpoint_file, 'r') as f:
+                        data = json.load(f)
                 logger.info(f"🔄 Loaded checkpoint: cycle={data.get('cycle', 0)}, phase={data.get('phase', 'unknown')}")
                 return data
         except Exception as e:
@@ -42,60 +64,95 @@ class AutoRecovery:
             "agent_states": {}
         }
     
-    def save(self):
-        """Save current checkpoint"""
-        self.state["last_save"] = datetime.now().isoformat()
-        try:
-            with open(self.checkpoint_file, 'w') as f:
-                json.dump(self.state, f, indent=2, default=str)
-        except Exception as e:
-            logger.error(f"Failed to save checkpoint: {e}")
+    def save(self, immediate: bool = False):
+        """Mark the checkpoint dirty; the background flusher writes it within SAVE_DEBOUNCE_SEC"""
+        with self._state_lock:
+            self.state["last_save"] = datetime.now().isoformat()
+        self._dirty.set()
+        if immediate:
+            self.flush()
+        elif self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, name="checkpoint-flusher", daemon=True)
+            self._flusher.start()
+    
+    def _flush_loop(self):
+        while True:
+            self._dirty.wait()
+            time.sleep(SAVE_DEBOUNCE_SEC)
+            self.flush()
+    
+    def flush(self):
+        """Write pending changes now, atomically (temp file + os.replace)"""
+        with self._write_lock:
+            if not self._dirty.is_set():
+                return
+            self._dirty.clear()
+            tmp_file = self.checkpoint_file + ".tmp"
+            try:
+                with self._state_lock:
+                    if orjson:
+                        data = orjson.dumps(self.state, default=str,
+                                            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                    else:
+                        data = json.dumps(self.state, indent=2, default=str).encode("utf-8")
+                with open(tmp_file, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_file, self.checkpoint_file)
+            except Exception as e:
+                self._dirty.set()  # keep it pending; the next flush retries
+                logger.error(f"Failed to save checkpoint: {e}")
     
     def start_cycle(self, cycle_num: int):
         """Mark start of a new cycle"""
-        self.state["cycle"] = cycle_num
-        self.state["phase"] = "pipeline"
-        self.state["completed_tasks"] = []
+        with self._state_lock:
+            self.state["cycle"] = cycle_num
+            self.state["phase"] = "pipeline"
+            self.state["completed_tasks"] = []
         self.save()
     
     def set_phase(self, phase: str):
         """Update current phase: pipeline, code_review, voting, planning, cooldown"""
-        self.state["phase"] = phase
+        with self._state_lock:
+            self.state["phase"] = phase
         self.save()
     
     def task_completed(self, task_id: int, task_title: str):
         """Record a completed task"""
-        self.state["completed_tasks"].append({
-            "id": task_id,
-            "title": task_title,
-            "completed_at": datetime.now().isoformat()
-        })
-        if task_id in self.state["pending_task_ids"]:
-            self.state["pending_task_ids"].remove(task_id)
+        with self._state_lock:
+            self.state["completed_tasks"].append({
+                "id": task_id,
+                "title": task_title,
+                "completed_at": datetime.now().isoformat()
+            })
+            if task_id in self.state["pending_task_ids"]:
+                self.state["pending_task_ids"].remove(task_id)
         self.save()
     
     def set_pending_tasks(self, task_ids: List[int]):
         """Set the list of pending task IDs"""
-        self.state["pending_task_ids"] = task_ids
+        with self._state_lock:
+            self.state["pending_task_ids"] = task_ids
         self.save()
     
     def record_crash(self, error: str = ""):
         """Record a crash event"""
-        self.state["crash_count"] = self.state.get("crash_count", 0) + 1
-        self.state["last_crash"] = {
-            "time": datetime.now().isoformat(),
-            "error": error[:500],
-            "phase": self.state.get("phase"),
-            "cycle": self.state.get("cycle")
-        }
-        self.save()
+        with self._state_lock:
+            self.state["crash_count"] = self.state.get("crash_count", 0) + 1
+            self.state["last_crash"] = {
+                "time": datetime.now().isoformat(),
+                "error": error[:500],
+                "phase": self.state.get("phase"),
+                "cycle": self.state.get("cycle")
+            }
+        self.save(immediate=True)  # The process may be going down
     
     def save_agent_state(self, agent_name: str, state: Dict):
         """Save individual agent state for recovery"""
-        self.state["agent_states"][agent_name] = {
-            **state,
-            "saved_at": datetime.now().isoformat()
-        }
+        with self._state_lock:
+            self.state["agent_states"][agent_name] = {
+                **state,
+                "saved_at": datetime.now().isoformat()
+            }
         self.save()
     
     def should_resume(self) -> bool:
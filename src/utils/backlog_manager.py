@@ -6,6 +6,7 @@ Manages the project task queue for agent collaboration.
 import json
 import os
 import logging
+from collections import defaultdict
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
@@ -13,13 +14,46 @@ logger = logging.getLogger(__name__)
 
 BACKLOG_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'backlog.json')
 
+# Scheduling: priority weight + wait urgency + short-job bonus; tasks past SLA go first
+PRIORITY_WEIGHT = {"critical": 3, "high": 2, "medium": 1, "low": 0}
+DEFAULT_MAX_WAIT_SEC = 3600
+
 
 class BacklogManager:
     """Manages project backlog for agent task assignment"""
     
-    def __init__(self):
+    def __init__(self, max_wait_time_sec: int = DEFAULT_MAX_WAIT_SEC):
         self.backlog_path = os.path.abspath(BACKLOG_PATH)
+        self.max_wait_time_sec = max_wait_time_sec
         self._ensure_backlog()
+        
+        # Reverse dependency index: task_id -> ids of tasks that depend on it
+        self._rev_deps: Dict[int, List[int]] = defaultdict(list)
+        self._rev_deps_mtime = None
+        self._refresh_dependency_index()
+    
+    def _file_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.backlog_path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def _refresh_dependency_index(self, data: Dict = None):
+        """Rebuild the reverse dependency index if the backlog file changed on disk"""
+        mtime = self._file_mtime()
+        if data is None and mtime == self._rev_deps_mtime:
+            return
+        tasks = (data or self._load())["tasks"]
+        self._rev_deps = defaultdict(list)
+        for task in tasks:
+            if task.get("depends_on"):
+                self._rev_deps[task["depends_on"]].append(task["id"])
+        self._rev_deps_mtime = mtime
+    
+    def reload(self):
+        """Re-sync derived state (dependency index) with the backlog file on disk"""
+        self._ensure_backlog()
+        self._refresh_dependency_index()
     
     def _ensure_backlog(self):
         """Create backlog file if it doesn't exist"""
@@ -58,6 +92,7 @@ class BacklogManager:
                  description: str = "", depends_on: int = None) -> Dict:
         """Add a task to the backlog"""
         data = self._load()
+        now = datetime.now().isoformat()
         task = {
             "id": data["next_id"],
             "title": title,
@@ -66,19 +101,48 @@ class BacklogManager:
             "status": "todo",
             "priority": priority,
             "depends_on": depends_on,
-            "created_at": datetime.now().isoformat(),
+            "created_at": now,
+            "queued_at": now,
             "completed_at": None
         }
         data["tasks"].append(task)
         data["next_id"] += 1
+        stale = self._file_mtime() != self._rev_deps_mtime
         self._save(data)
+        if stale:
+            self._refresh_dependency_index(data)
+        else:
+            if depends_on:
+                self._rev_deps[depends_on].append(task["id"])
+            self._rev_deps_mtime = self._file_mtime()
         logger.info(f"Added task #{task['id']}: {title} -> {assigned_to}")
         return task
     
+    def _wait_seconds(self, task: Dict, now: datetime) -> float:
+        queued = task.get("queued_at") or task.get("created_at")
+        try:
+            return max(0.0, (now - datetime.fromisoformat(queued)).total_seconds())
+        except (TypeError, ValueError):
+            return 0.0
+    
+    def score_task(self, task: Dict, now: datetime = None) -> float:
+        """
+        Scheduling score (higher runs first):
+        urgency (wait / max_wait) + short-job bonus + priority weight.
+        Tasks waiting past the SLA are forced ahead of everything else.
+        """
+        now = now or datetime.now()
+        waited = self._wait_seconds(task, now)
+        urgency = waited / self.max_wait_time_sec
+        short_job_bonus = 1.0 / (1.0 + len(task.get("description", "")) / 500.0)
+        score = urgency + short_job_bonus + PRIORITY_WEIGHT.get(task.get("priority"), 1)
+        if waited >= self.max_wait_time_sec:
+            score += 1000.0  # SLA breached
+        return score
+    
     def get_next_task(self, agent_name: str) -> Optional[Dict]:
-        """Get the highest priority pending task for an agent"""
+        """Get the best-scoring ready task for an agent (see score_task)"""
         data = self._load()
-        priority_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
         
         candidates = []
         for task in data["tasks"]:
@@ -93,8 +157,8 @@ class BacklogManager:
         if not candidates:
             return None
         
-        candidates.sort(key=lambda t: priority_order.get(t["priority"], 2))
-        return candidates[0]
+        now = datetime.now()
+        return max(candidates, key=lambda t: self.score_task(t, now))
     
     def update_status(self, task_id: int, status: str) -> str:
         """Update task status: todo, in_progress, done, blocked"""
@@ -108,6 +172,16 @@ class BacklogManager:
                 return f"Task #{task_id} status -> {status}"
         return f"Task #{task_id} not found."
     
+    def get_dependents(self, task_id: int) -> List[Dict]:
+        """Get tasks that depend directly on task_id (via the reverse dependency index)"""
+        data = self._load()
+        if self._file_mtime() != self._rev_deps_mtime:
+            self._refresh_dependency_index(data)
+        dependent_ids = set(self._rev_deps.get(task_id, ()))
+        if not dependent_ids:
+            return []
+        return [t for t in data["tasks"] if t["id"] in dependent_ids]
+    
     def get_all_tasks(self) -> List[Dict]:
         """Get all tasks"""
         return self._load()["tasks"]
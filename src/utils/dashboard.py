@@ -13,11 +13,24 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 
 try:
-    from flask import Flask, jsonify, render_template_string
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from flask import Flask, Response, jsonify, render_template_string
 except ImportError:
     Flask = None
     logger.info("Flask not installed — dashboard disabled. Run: pip install flask")
 
+try:
+    from waitress import serve as waitress_serve
+except ImportError:
+    waitress_serve = None
+
+# Worker threads for the production WSGI server
+DASHBOARD_THREADS = 16
+
 
 DASHBOARD_HTML = """
 <!DOCTYPE html>
@@ -324,6 +337,8 @@ class Dashboard:
         
         @self.app.route('/api/status')
         def api_status():
+            if orjson:
+                return Response(orjson.dumps(self.data, default=str), mimetype='application/json')
             return jsonify(self.data)
     
     def start(self):
@@ -331,11 +346,15 @@ class Dashboard:
         if not self.app:
             return
         
-        self.thread = threading.Thread(
-            target=self.app.run,
-            kwargs={"host": "0.0.0.0", "port": self.port, "debug": False, "use_reloader": False},
-            daemon=True
-        )
+        if waitress_serve is not None:
+            target, args = waitress_serve, (self.app,)
+            kwargs = {"host": "0.0.0.0", "port": self.port, "threads": DASHBOARD_THREADS}
+        else:
+            logger.warning("waitress not installed — dashboard on Flask dev server. Run: pip install waitress")
+            target, args = self.app.run, ()
+            kwargs = {"host": "0.0.0.0", "port": self.port, "debug": False,
+                      "use_reloader": False, "threaded": True}
+        self.thread = threading.Thread(target=target, args=args, kwargs=kwargs, daemon=True)
         self.thread.start()
         logger.info(f"📊 Dashboard running at http://localhost:{self.port}")
     
@@ -366,6 +385,14 @@ class Dashboard:
         if len(self.data["logs"]) > 100:
             self.data["logs"] = self.data["logs"][-100:]
     
+    def add_logs(self, messages: list):
+        """Add several log entries at once (one timestamp, one trim)"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        logs = self.data["logs"]
+        logs.extend(f"[{timestamp}] {message}" for message in messages)
+        if len(logs) > 100:
+            self.data["logs"] = logs[-100:]
+    
     def set_cycle(self, cycle: int):
         """Set current cycle number"""
         self.data["cycle"] = cycle
@@ -0,0 +1,122 @@
+"""
+Kelly Position Sizing
+Closed-form Kelly fraction for a single binary bet, plus a Newton solver for the
+multi-asset growth-optimal portfolio over return scenarios.
+Numba-compiled when numba is installed; plain Python/NumPy otherwise.
+"""
+
+import re
+import logging
+from typing import Dict, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """No-op stand-in so the functions below still run uncompiled"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+logger = logging.getLogger(__name__)
+
+
+@njit(cache=True, fastmath=True)
+def kelly_binary(p: float, a: float, b: float) -> float:
+    """
+    Kelly fraction for a bet won with probability p.
+    A win gains fraction b of the stake, a loss loses fraction a: k = p/a - (1-p)/b
+    """
+    return p / a - (1.0 - p) / b
+
+
+@njit(cache=True)
+def kelly_portfolio(returns, iterations=20):
+    """
+    Growth-optimal fractions f maximizing mean(log(1 + returns @ f)).
+    returns: (scenarios, assets) float array of per-period simple returns.
+    Newton steps on the gradient/Hessian, halved while any outcome would wipe out capital.
+    """
+    n_obs, n_assets = returns.shape
+    f = np.zeros(n_assets)
+    for _ in range(iterations):
+        grad = np.zeros(n_assets)
+        hess = np.zeros((n_assets, n_assets))
+        for t in range(n_obs):
+            r = returns[t]
+            w = 1.0 + np.dot(r, f)
+            grad += r / w
+            hess -= np.outer(r, r) / (w * w)
+        step = np.linalg.solve(hess, grad)
+        alpha = 1.0
+        while alpha > 1e-8 and np.min(1.0 + returns @ (f - alpha * step)) <= 0.0:
+            alpha *= 0.5
+        f = f - alpha * step
+        if np.max(np.abs(alpha * step)) < 1e-10:
+            break
+    return f
+
+
+# "win rate: 55%", "avg_win = 0.04", "capital $10,000", "p=0.55" (single letters need : or =)
+_VALUE = r"\s*\$?\s*(\d[\d,]*(?:\.\d+)?)\s*(%)?"
+_NUMBER = r"\s*(?:[:=]|is|of)?" + _VALUE
+
+
+def _input_re(names: str, letter: str = "") -> re.Pattern:
+    pattern = r"\b(?:" + names + r")" + _NUMBER
+    if letter:
+        pattern += r"|\b" + letter + r"\s*[:=]" + _VALUE
+    return re.compile(pattern, re.I)
+
+
+_INPUT_PATTERNS = {
+    "capital": _input_re(r"capital"),
+    "p": _input_re(r"win[ _-]?(?:rate|prob(?:ability)?)", "p"),
+    "b": _input_re(r"avg[ _-]?win|average[ _-]win|win[ _-]?size", "b"),
+    "a": _input_re(r"avg[ _-]?loss|average[ _-]loss|loss[ _-]?size", "a"),
+}
+
+
+def parse_kelly_inputs(text: str) -> Optional[Dict[str, float]]:
+    """
+    Pull capital, win probability p and win/loss fractions b/a from a task description.
+    Only values written with % are converted from percent. Bare p, a and b must already
+    be fractions in (0, 1], and a/b must use the same unit (both % or both bare).
+    Returns None when anything is missing or ambiguous, so the caller can fall back.
+    """
+    values, percents = {}, {}
+    for key, pattern in _INPUT_PATTERNS.items():
+        m = pattern.search(text)
+        if not m:
+            continue
+        number, percent = (m.group(1), m.group(2)) if m.group(1) else (m.group(3), m.group(4))
+        value = float(number.replace(",", ""))
+        if key != "capital" and percent:
+            value /= 100.0
+        values[key] = value
+        percents[key] = bool(percent)
+    if not all(k in values for k in ("p", "a", "b")):
+        return None
+    if percents["a"] != percents["b"]:
+        return None
+    if not (0.0 < values["p"] < 1.0 and 0.0 < values["a"] <= 1.0 and 0.0 < values["b"] <= 1.0):
+        return None
+    return values
+
+
+def position_size(p: float, a: float, b: float, capital: Optional[float] = None,
+                  max_position_pct: float = 100.0, max_loss_pct: float = 100.0) -> Dict[str, float]:
+    """Kelly fraction clipped to the position cap and the max loss per trade"""
+    kelly = kelly_binary(p, a, b)
+    fraction = min(max(kelly, 0.0), max_position_pct / 100.0, (max_loss_pct / 100.0) / a)
+    result = {"kelly_fraction": kelly, "fraction": fraction}
+    if capital is not None:
+        result["capital"] = capital
+        result["position"] = capital * fraction
+        result["max_loss"] = capital * fraction * a
+    return result
@@ -5,14 +5,29 @@ multi-model routing, and rate limit protection.
 """
 
 import os
+import re
+import atexit
+import json
 import time
+import asyncio
 import logging
+import hashlib
 import threading
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Callable, Tuple
 try:
     from openai import OpenAI
 except ImportError:
     OpenAI = None
+try:
+    import httpx
+except ImportError:
+    httpx = None
+try:
+    import h2  # noqa: F401 — enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +44,32 @@ COMPLEX_KEYWORDS = [
     "architecture", "refactor", "security review", "debug complex"
 ]
 
+# Adaptive (AIMD) concurrency for async calls shared by all clients
+MAX_CONCURRENT_CALLS = 8          # Starting in-flight permits
+MAX_CONCURRENT_CALLS_CEILING = 32
+AIMD_INCREASE_AFTER = 100         # Consecutive successes before adding a permit
+
+# Retry policy for 429 / 5xx responses
+MAX_THROTTLE_RETRIES = 5
+
+# Response cache knobs (0 TTL disables caching)
+LLM_CACHE_TTL_SECONDS = int(os.environ.get("LLM_CACHE_TTL_SECONDS", "600"))
+LLM_CACHE_MAXSIZE = int(os.environ.get("LLM_CACHE_MAXSIZE", "1024"))
+
+# Output cap for a single completion
+MAX_COMPLETION_TOKENS = 4000
+
+# Micro-batching: instructions appended to a shared system prompt when packing requests
+BATCH_INSTRUCTIONS = (
+    "\n\nYou will receive a JSON array of independent requests, each with an \"id\" and a \"prompt\". "
+    "Answer every request separately and concisely, and return ONLY a JSON array where each item is "
+    "{\"id\": <id>, \"response\": \"<your reply>\"}."
+)
+# Only short-answer prompts are packed: each packed request gets this much output budget,
+# and a packed call never asks for more than BATCH_MAX_TOKENS (which bounds the group size)
+BATCH_ITEM_TOKENS = 512
+BATCH_MAX_TOKENS = 8192
+
 
 class RateLimiter:
     """Feature 20: Token bucket rate limiter"""
@@ -85,9 +126,230 @@ class RateLimiter:
         }
 
 
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit for async LLM calls: one more permit after a run of
+    successes, half the permits whenever the API throttles (429) or fails (5xx).
+    """
+    
+    def __init__(self, initial: int = MAX_CONCURRENT_CALLS, minimum: int = 1,
+                 maximum: int = MAX_CONCURRENT_CALLS_CEILING, increase_after: int = AIMD_INCREASE_AFTER):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase_after = increase_after
+        self.in_flight = 0
+        self.successes = 0
+        self.decreases = 0
+        self._cond: Optional[asyncio.Condition] = None
+        self._loop = None
+    
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._loop is not loop:
+            # Conditions are bound to one event loop; rebind if a new loop is running
+            self._cond = asyncio.Condition()
+            self._loop = loop
+            self.in_flight = 0
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+    
+    async def release(self, throttled: bool = False):
+        async with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit // 2)
+                self.successes = 0
+                self.decreases += 1
+                logger.warning(f"⏬ LLM concurrency reduced to {self.limit}")
+            else:
+                self.successes += 1
+                if self.successes >= self.increase_after and self.limit < self.maximum:
+                    self.limit += 1
+                    self.successes = 0
+            self._cond.notify_all()
+    
+    def get_stats(self) -> Dict:
+        return {"limit": self.limit, "in_flight": self.in_flight, "decreases": self.decreases}
+
+
+class ResponseCache:
+    """LRU + TTL cache for chat completions, keyed by a SHA-256 of the request"""
+    
+    def __init__(self, maxsize: int = LLM_CACHE_MAXSIZE, ttl_seconds: int = LLM_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl_seconds
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (stored_at, response)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+    
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]], temperature: float) -> str:
+        payload = json.dumps([model, messages, temperature], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or time.time() - entry[0] > self.ttl:
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, key: str, response: str):
+        with self.lock:
+            self.entries[key] = (time.time(), response)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+    
+    def get_stats(self) -> Dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
+
+
+class MicroBatcher:
+    """
+    Coalesce chat requests that arrive within a short window into one API call.
+    Requests sharing the same system prompt and temperature are packed as a JSON
+    array and de-multiplexed by id; anything that cannot be packed or parsed falls
+    back to an individual call.
+    """
+    
+    def __init__(self, client: "DeepSeekClient", max_batch: int = 16, max_wait_ms: int = 10):
+        self.client = client
+        self.max_batch = min(max_batch, BATCH_MAX_TOKENS // BATCH_ITEM_TOKENS)
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue: Optional[asyncio.Queue] = None
+        self.worker: Optional[asyncio.Task] = None
+        self.total_batches = 0
+        self.total_batched_requests = 0
+    
+    async def submit(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> str:
+        """Queue a request and wait for its response"""
+        if self.queue is None:
+            self.queue = asyncio.Queue()
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((messages, temperature, future))
+        if self.worker is None or self.worker.done():
+            self.worker = asyncio.create_task(self._drain())
+        return await future
+    
+    async def _drain(self):
+        """Collect up to max_batch requests per window and dispatch them; exits when idle"""
+        loop = asyncio.get_running_loop()
+        while not self.queue.empty():
+            batch = [self.queue.get_nowait()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            groups: Dict[tuple, List] = {}
+            for item in batch:
+                messages, temperature, _ = item
+                if len(messages) == 2 and messages[0].get("role") == "system" and messages[1].get("role") == "user":
+                    key = (messages[0]["content"], temperature)
+                else:
+                    key = (id(item), temperature)  # Not packable: dispatch alone
+                groups.setdefault(key, []).append(item)
+            
+            await asyncio.gather(*(self._dispatch(group) for group in groups.values()))
+    
+    async def _dispatch(self, group: List):
+        if len(group) == 1:
+            await self._dispatch_single(group[0])
+            return
+        
+        system_prompt = group[0][0][0]["content"]
+        temperature = group[0][1]
+        packed = [{"id": i, "prompt": item[0][1]["content"]} for i, item in enumerate(group)]
+        
+        responses = {}
+        try:
+            reply = await self.client.chat_completion_async([
+                {"role": "system", "content": system_prompt + BATCH_INSTRUCTIONS},
+                {"role": "user", "content": json.dumps(packed, ensure_ascii=False)}
+            ], temperature, cache=False, max_tokens=BATCH_ITEM_TOKENS * len(group))
+            match = re.search(r'\[[\s\S]*\]', reply or "")
+            if match:
+                for entry in json.loads(match.group()):
+                    if isinstance(entry, dict) and isinstance(entry.get("id"), int):
+                        responses[entry["id"]] = str(entry.get("response", ""))
+            self.total_batches += 1
+            self.total_batched_requests += len(responses)
+        except Exception as e:
+            logger.warning(f"Batched call failed, falling back to single calls: {e}")
+        
+        fallbacks = []
+        for i, item in enumerate(group):
+            if i in responses:
+                if not item[2].done():
+                    item[2].set_result(responses[i])
+            else:
+                fallbacks.append(self._dispatch_single(item))
+        if fallbacks:
+            await asyncio.gather(*fallbacks)
+    
+    async def _dispatch_single(self, item):
+        messages, temperature, future = item
+        try:
+            result = await self.client.chat_completion_async(messages, temperature, cache=False)
+            if not future.done():
+                future.set_result(result)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+
+
 class DeepSeekClient:
     """Client for interacting with DeepSeek API with cost tracking, multi-model routing, and rate limiting"""
     
+    # Shared across instances so concurrent agents respect one global cap
+    _limiter = AdaptiveConcurrencyLimiter()
+    
+    # One long-lived connection pool for every client instance
+    _http_client = None
+    
+    # api_key -> client shared by every agent, so their calls coalesce in one batcher
+    _shared_clients: Dict[str, "DeepSeekClient"] = {}
+    _shared_lock = threading.Lock()
+    
+    @classmethod
+    def _shared_http_client(cls):
+        """Keep-alive HTTP client reused by all agents (HTTP/2 when h2 is installed)"""
+        if cls._http_client is None and httpx is not None:
+            cls._http_client = httpx.Client(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+                timeout=120.0
+            )
+            atexit.register(cls._http_client.close)
+        return cls._http_client
+    
+    @classmethod
+    def shared(cls, api_key: str) -> "DeepSeekClient":
+        """Process-wide client for api_key (one batcher, response cache and cost ledger)"""
+        with cls._shared_lock:
+            client = cls._shared_clients.get(api_key)
+            if client is None:
+                client = cls._shared_clients[api_key] = cls(api_key=api_key)
+            return client
+    
     def __init__(self, api_key: str, model: str = "deepseek-chat",
                  enable_auto_routing: bool = True,
                  rate_limit_calls: int = 60,
@@ -99,7 +361,8 @@ class DeepSeekClient:
             self.client = OpenAI(
                 api_key=api_key,
                 base_url="https://api.deepseek.com",
-                timeout=120.0  # 120s timeout to prevent indefinite hangs
+                timeout=120.0,  # 120s timeout to prevent indefinite hangs
+                http_client=self._shared_http_client()
             )
             
         self.model = model
@@ -111,9 +374,16 @@ class DeepSeekClient:
         self.total_calls = 0
         self.total_cost_usd = 0.0
         self.calls_per_model = {}  # Feature 12: track per-model usage
+        self._usage_lock = threading.Lock()  # Calls may run in worker threads
         
         # Feature 20: Rate limiter
         self.rate_limiter = RateLimiter(rate_limit_calls, rate_limit_tokens)
+        
+        # Micro-batching for bursty async callers
+        self.batcher = MicroBatcher(self)
+        
+        # Response cache for repeated prompts
+        self.cache = ResponseCache()
     
     def _select_model(self, messages: List[Dict[str, str]]) -> str:
         """Feature 12: Auto-select model based on task complexity"""
@@ -131,12 +401,119 @@ class DeepSeekClient:
         
         return self.model  # Default to cheaper model
     
+    def _cache_key(self, messages: List[Dict[str, str]], temperature: float,
+                   model_override: str = None) -> Optional[str]:
+        if not self.cache.enabled:
+            return None
+        return ResponseCache.make_key(model_override or self._select_model(messages), messages, temperature)
+    
     def chat_completion(self, messages: List[Dict[str, str]], temperature: float = 0.7,
-                        model_override: str = None) -> str:
-        """Get chat completion from DeepSeek with cost tracking, auto-routing, and rate limiting"""
+                        model_override: str = None, cache: bool = True) -> str:
+        """
+        Get chat completion from DeepSeek with cost tracking, auto-routing, and rate limiting.
+        Identical requests are served from the response cache unless cache=False.
+        """
+        return self._complete(messages, temperature, model_override, cache)[0]
+    
+    @staticmethod
+    def _is_throttle_error(e: Exception) -> bool:
+        """429 and 5xx responses are retried with backoff and shrink concurrency"""
+        status = getattr(e, "status_code", None)
+        if status == 429 or (isinstance(status, int) and status >= 500):
+            return True
+        error_str = str(e)
+        return "rate_limit" in error_str.lower() or "429" in error_str
+    
+    def _complete(self, messages: List[Dict[str, str]], temperature: float,
+                  model_override: str, cache: bool, max_tokens: int = MAX_COMPLETION_TOKENS):
+        """Run a completion; returns (content, throttled) where throttled flags any 429/5xx seen"""
         if self.client is None:
-            return "Error: LLM client not initialized (missing openai package)"
+            return "Error: LLM client not initialized (missing openai package)", False
+            
+        if not any(m['role'] == 'system' for m in messages):
+            messages.insert(0, {"role": "system", "content": "You are a helpful AI assistant. Always respond in Vietnamese unless asked otherwise."})
+        
+        # Feature 12: Select model
+        selected_model = model_override or self._select_model(messages)
+        
+        cache_key = ResponseCache.make_key(selected_model, messages, temperature) if cache and self.cache.enabled else None
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached, False
+        
+        throttled = False
+        for attempt in range(MAX_THROTTLE_RETRIES + 1):
+            # Feature 20: Rate limiting
+            self.rate_limiter.wait_if_needed()
+            
+            try:
+                response = self.client.chat.completions.create(
+                    model=selected_model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=False,
+                    timeout=60.0  # Per-request timeout
+                )
+            except Exception as e:
+                if self._is_throttle_error(e) and attempt < MAX_THROTTLE_RETRIES:
+                    throttled = True
+                    wait_time = min(60, 5 * 2 ** attempt)
+                    logger.warning(f"🚫 API rate limit / server error! Waiting {wait_time}s (retry {attempt + 1}/{MAX_THROTTLE_RETRIES})...")
+                    time.sleep(wait_time)
+                    continue
+                logger.error(f"DeepSeek API Error: {e}")
+                return f"Error communicating with AI: {e}", throttled or self._is_throttle_error(e)
+            
+            # Track token usage
+            if response.usage:
+                self._record_usage(selected_model, response.usage)
+            
+            content = response.choices[0].message.content
+            if cache_key and content:
+                self.cache.put(cache_key, content)
+            return content, throttled
+
+    def _record_usage(self, selected_model: str, usage):
+        """Add one call's token usage and cost to the running totals"""
+        prompt_tokens = usage.prompt_tokens or 0
+        completion_tokens = usage.completion_tokens or 0
+        total_tokens = prompt_tokens + completion_tokens
+        
+        # Calculate cost
+        pricing = PRICING.get(selected_model, PRICING["deepseek-chat"])
+        call_cost = (prompt_tokens * pricing["input"] + completion_tokens * pricing["output"]) / 1_000_000
+        
+        with self._usage_lock:
+            self.total_prompt_tokens += prompt_tokens
+            self.total_completion_tokens += completion_tokens
+            self.total_calls += 1
             
+            # Feature 12: Per-model tracking
+            self.calls_per_model[selected_model] = self.calls_per_model.get(selected_model, 0) + 1
+            self.total_cost_usd += call_cost
+        
+        # Feature 20: Record actual tokens used
+        self.rate_limiter.record_tokens(total_tokens)
+    
+    def chat_completion_stream(self, messages: List[Dict[str, str]], temperature: float = 0.7,
+                               model_override: str = None,
+                               validator: Callable[[str], Optional[str]] = None) -> Tuple[str, Optional[str]]:
+        """
+        Stream a completion and validate it incrementally.
+        validator(text_so_far) runs whenever a chunk closes a bracketed marker and
+        returns an error string to stop generation early.
+        Returns (text, validation_error); text is partial when validation_error is set.
+        """
+        return self._stream(messages, temperature, model_override, validator)[:2]
+    
+    def _stream(self, messages: List[Dict[str, str]], temperature: float,
+                model_override: str, validator: Optional[Callable[[str], Optional[str]]]):
+        """Streaming worker; returns (text, validation_error, throttled)"""
+        if self.client is None:
+            return "Error: LLM client not initialized (missing openai package)", None, False
+        
         if not any(m['role'] == 'system' for m in messages):
             messages.insert(0, {"role": "system", "content": "You are a helpful AI assistant. Always respond in Vietnamese unless asked otherwise."})
         
@@ -147,49 +524,102 @@ class DeepSeekClient:
         self.rate_limiter.wait_if_needed()
         
         try:
-            response = self.client.chat.completions.create(
+            stream = self.client.chat.completions.create(
                 model=selected_model,
                 messages=messages,
                 temperature=temperature,
-                max_tokens=4000,
-                stream=False,
-                timeout=60.0  # Per-request timeout
+                max_tokens=MAX_COMPLETION_TOKENS,
+                stream=True,
+                stream_options={"include_usage": True},
+                timeout=60.0
             )
-            
-            # Track token usage
-            if response.usage:
-                prompt_tokens = response.usage.prompt_tokens or 0
-                completion_tokens = response.usage.completion_tokens or 0
-                total_tokens = prompt_tokens + completion_tokens
-                
-                self.total_prompt_tokens += prompt_tokens
-                self.total_completion_tokens += completion_tokens
-                self.total_calls += 1
-                
-                # Feature 12: Per-model tracking
-                self.calls_per_model[selected_model] = self.calls_per_model.get(selected_model, 0) + 1
-                
-                # Feature 20: Record actual tokens used
-                self.rate_limiter.record_tokens(total_tokens)
-                
-                # Calculate cost
-                pricing = PRICING.get(selected_model, PRICING["deepseek-chat"])
-                call_cost = (prompt_tokens * pricing["input"] + completion_tokens * pricing["output"]) / 1_000_000
-                self.total_cost_usd += call_cost
-            
-            return response.choices[0].message.content
         except Exception as e:
-            error_str = str(e)
-            if "rate_limit" in error_str.lower() or "429" in error_str:
-                logger.warning("🚫 API rate limit hit! Waiting 10s...")
-                time.sleep(10)
-                return self.chat_completion(messages, temperature, model_override)
+            if self._is_throttle_error(e):
+                # Fall back to the non-streaming path, which owns retry/backoff
+                content, _ = self._complete(messages, temperature, model_override, False)
+                return content, None, True
             logger.error(f"DeepSeek API Error: {e}")
-            return f"Error communicating with AI: {error_str}"
-
-    async def chat_completion_async(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> str:
-        """Async version of chat completion"""
-        return self.chat_completion(messages, temperature)
+            return f"Error communicating with AI: {e}", None, False
+        
+        parts = []
+        validation_error = None
+        try:
+            for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    self._record_usage(selected_model, chunk.usage)
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                if not delta:
+                    continue
+                parts.append(delta)
+                if validator and "]" in delta:
+                    validation_error = validator("".join(parts))
+                    if validation_error:
+                        logger.info(f"✂️ Stopping generation early: {validation_error[:100]}")
+                        break
+        except Exception as e:
+            logger.error(f"DeepSeek stream error: {e}")
+            if not parts:
+                return f"Error communicating with AI: {e}", None, self._is_throttle_error(e)
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+        
+        return "".join(parts), validation_error, False
+    
+    async def _run_limited(self, worker: Callable, *args):
+        """Run a blocking worker in a thread under the shared AIMD limiter; worker returns (..., throttled)"""
+        limiter = DeepSeekClient._limiter
+        await limiter.acquire()
+        throttled = False
+        try:
+            result = await asyncio.to_thread(worker, *args)
+            throttled = result[-1]
+            return result[:-1]
+        finally:
+            await limiter.release(throttled)
+    
+    async def chat_completion_async(self, messages: List[Dict[str, str]], temperature: float = 0.7,
+                                    model_override: str = None, cache: bool = True,
+                                    max_tokens: int = MAX_COMPLETION_TOKENS) -> str:
+        """
+        Async version of chat completion.
+        Runs the blocking request in a worker thread so callers can fan out
+        with asyncio.gather; in-flight calls are capped by the shared AIMD limiter.
+        """
+        return (await self._run_limited(self._complete, messages, temperature, model_override, cache, max_tokens))[0]
+    
+    async def chat_completion_stream_async(self, messages: List[Dict[str, str]], temperature: float = 0.7,
+                                           model_override: str = None,
+                                           validator: Callable[[str], Optional[str]] = None) -> Tuple[str, Optional[str]]:
+        """Async version of chat_completion_stream"""
+        return await self._run_limited(self._stream, messages, temperature, model_override, validator)
+    
+    async def abatched_chat(self, messages: List[Dict[str, str]], temperature: float = 0.7,
+                            cache: bool = True, pack: bool = False) -> str:
+        """
+        Async chat completion (cached unless cache=False).
+        pack=True routes it through the micro-batcher; only use it for short-answer prompts
+        (decisions, votes), since a packed reply shares a BATCH_ITEM_TOKENS-per-request budget.
+        """
+        if self.client is None:
+            return "Error: LLM client not initialized (missing openai package)"
+        
+        cache_key = self._cache_key(messages, temperature) if cache else None
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        if pack:
+            result = await self.batcher.submit(messages, temperature)
+        else:
+            result = await self.chat_completion_async(messages, temperature, cache=False)
+        if cache_key and result and not result.startswith("Error"):
+            self.cache.put(cache_key, result)
+        return result
     
     def get_usage_report(self) -> Dict[str, Any]:
         """Get usage and cost report"""
@@ -202,7 +632,11 @@ class DeepSeekClient:
             "avg_cost_per_call": round(self.total_cost_usd / max(self.total_calls, 1), 6),
             "model": self.model,
             "calls_per_model": self.calls_per_model,
-            "rate_limiter": self.rate_limiter.get_stats()
+            "rate_limiter": self.rate_limiter.get_stats(),
+            "concurrency": DeepSeekClient._limiter.get_stats(),
+            "batched_requests": self.batcher.total_batched_requests,
+            "batches": self.batcher.total_batches,
+            "cache": self.cache.get_stats()
         }
     
     def get_cost_summary(self) -> str:
@@ -5,11 +5,22 @@ Handles persistent long-term memory for agents using JSON files.
 
 import os
 import json
+import sqlite3
 import logging
 from typing import Dict, Any, List, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Facts kept resident per agent; older ones spill to an on-disk SQLite archive
+MAX_RESIDENT_FACTS = 256
+# Memory dirs already created by this process
+_ensured_dirs = set()
+
 class AgentMemory:
     """Persistent memory for an agent"""
     
@@ -17,10 +28,14 @@ class AgentMemory:
         self.agent_name = agent_name
         self.memory_dir = memory_dir
         self.memory_file = os.path.join(memory_dir, f"{agent_name}.json")
+        self.archive_file = os.path.join(memory_dir, f"{agent_name}_archive.db")
         self.data = {}
+        self._archive = None
         
-        # Ensure directory exists
-        os.makedirs(memory_dir, exist_ok=True)
+        # Ensure directory exists (once per process)
+        if memory_dir not in _ensured_dirs:
+            os.makedirs(memory_dir, exist_ok=True)
+            _ensured_dirs.add(memory_dir)
         
         # Load existing memory
         self.load()
@@ -29,8 +44,12 @@ class AgentMemory:
         """Load memory from file"""
         try:
             if os.path.exists(self.memory_file):
-                with open(self.memory_file, 'r', encoding='utf-8') as f:
-                    self.data = json.load(f)
+                if orjson:
+                    with open(self.memory_file, 'rb') as f:
+                        self.data = orjson.loads(f.read())
+                else:
+                    with open(self.memory_file, 'r', encoding='utf-8') as f:
+                        self.data = json.load(f)
                 logger.info(f"Loaded memory for {self.agent_name}")
             else:
                 self.data = {"facts": {}, "experiences": []}
@@ -42,20 +61,59 @@ class AgentMemory:
     def save(self):
         """Save memory to file"""
         try:
+            # Rewritten on every LEARN; orjson encodes the whole store in C
+            if orjson:
+                with open(self.memory_file, 'wb') as f:
+                    f.write(orjson.dumps(self.data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+                return
             with open(self.memory_file, 'w', encoding='utf-8') as f:
                 json.dump(self.data, f, indent=2, ensure_ascii=False)
         except Exception as e:
             logger.error(f"Failed to save memory: {e}")
 
+    def _archive_db(self) -> sqlite3.Connection:
+        """Lazily open the spill archive (one connection per agent)"""
+        if self._archive is None:
+            self._archive = sqlite3.connect(self.archive_file, check_same_thread=False)
+            self._archive.execute("PRAGMA journal_mode=WAL")
+            self._archive.execute(
+                "CREATE TABLE IF NOT EXISTS facts (key TEXT PRIMARY KEY, value TEXT)"
+            )
+        return self._archive
+
+    def _spill_facts(self):
+        """Evict least-recently stored facts beyond MAX_RESIDENT_FACTS to the archive"""
+        facts = self.data["facts"]
+        overflow = len(facts) - MAX_RESIDENT_FACTS
+        if overflow <= 0:
+            return
+        evicted = [(k, facts.pop(k)) for k in list(facts)[:overflow]]
+        try:
+            with self._archive_db() as db:
+                db.executemany("INSERT OR REPLACE INTO facts VALUES (?, ?)", evicted)
+        except Exception as e:
+            logger.error(f"Failed to archive facts: {e}")
+
     def remember_fact(self, key: str, value: str) -> str:
         """Store a fact"""
-        self.data["facts"][key] = value
+        facts = self.data["facts"]
+        facts.pop(key, None)  # re-insert so the key becomes most recent
+        facts[key] = value
+        self._spill_facts()
         self.save()
         return f"Fact stored: {key} = {value}"
 
     def recall_fact(self, key: str) -> str:
         """Retrieve a fact"""
         value = self.data["facts"].get(key)
+        if not value and os.path.exists(self.archive_file):
+            try:
+                row = self._archive_db().execute(
+                    "SELECT value FROM facts WHERE key = ?", (key,)
+                ).fetchone()
+                value = row[0] if row else None
+            except Exception as e:
+                logger.error(f"Failed to read fact archive: {e}")
         if value:
             return f"Recalled: {key} = {value}"
         return f"I don't remember anything about '{key}'."
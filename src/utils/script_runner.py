@@ -0,0 +1,212 @@
+"""
+Script Runner Pool
+Runs agent-written Python scripts without paying interpreter startup per run.
+Each pool worker is a long-lived interpreter that pre-imports the heavy data
+libraries once, then forks a fresh child per script (copy-on-write), so every
+run is isolated but starts with numpy/pandas already loaded.
+Platforms without os.fork fall back to a plain `python script.py` subprocess.
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import logging
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Imported once per worker; missing ones are skipped
+PRELOAD_MODULES = ("numpy", "pandas")
+# Bytes of stdout/stderr returned per run
+OUTPUT_CAP = 64 * 1024
+
+FORK_AVAILABLE = hasattr(os, "fork")
+
+
+class ScriptRunnerPool:
+    """Pool of pre-warmed interpreter workers; run() returns (returncode, stdout, stderr)"""
+
+    def __init__(self, size: int = 4, max_runs: int = 50):
+        self.size = size
+        self.max_runs = max_runs  # Workers are recycled after this many scripts
+        self._idle: Optional[asyncio.Queue] = None
+        self._spawned = 0
+        self.total_runs = 0
+
+    async def run(self, filepath: str, cwd: str, timeout: float = 30) -> Tuple[int, str, str]:
+        """
+        Run filepath as __main__ with cwd as working directory.
+        Raises asyncio.TimeoutError if it does not finish within timeout.
+        """
+        self.total_runs += 1
+        # The child chdirs to cwd before running, so relative paths would break
+        filepath, cwd = os.path.abspath(filepath), os.path.abspath(cwd)
+        if not FORK_AVAILABLE:
+            return await self._run_subprocess(filepath, cwd, timeout)
+
+        worker = await self._acquire()
+        try:
+            job = json.dumps({"path": filepath, "cwd": cwd, "timeout": timeout}) + "\n"
+            worker["proc"].stdin.write(job.encode("utf-8"))
+            await worker["proc"].stdin.drain()
+            # The worker enforces the timeout itself; the margin covers a hung worker
+            line = await asyncio.wait_for(worker["proc"].stdout.readline(), timeout + 10)
+            if not line:
+                raise RuntimeError("script worker exited unexpectedly")
+            reply = json.loads(line)
+        except BaseException:
+            await self._discard(worker)
+            raise
+
+        worker["runs"] += 1
+        self._release(worker)
+        if reply.get("timed_out"):
+            raise asyncio.TimeoutError()
+        return reply["returncode"], reply["stdout"], reply["stderr"]
+
+    async def _acquire(self) -> dict:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+        if self._idle.empty() and self._spawned < self.size:
+            self._spawned += 1
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    sys.executable, "-u", os.path.abspath(__file__),
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE
+                )
+            except BaseException:
+                self._spawned -= 1
+                raise
+            return {"proc": proc, "runs": 0}
+        return await self._idle.get()
+
+    def _release(self, worker: dict):
+        if worker["runs"] >= self.max_runs or worker["proc"].returncode is not None:
+            worker["proc"].stdin.close()  # Worker exits on EOF
+            self._spawned -= 1
+        else:
+            self._idle.put_nowait(worker)
+
+    async def _discard(self, worker: dict):
+        self._spawned -= 1
+        if worker["proc"].returncode is None:
+            worker["proc"].kill()
+            await worker["proc"].wait()
+
+    @staticmethod
+    async def _run_subprocess(filepath: str, cwd: str, timeout: float) -> Tuple[int, str, str]:
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, filepath,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+        return (proc.returncode,
+                stdout[:OUTPUT_CAP].decode("utf-8", errors="replace"),
+                stderr[:OUTPUT_CAP].decode("utf-8", errors="replace"))
+
+
+# ----------------------------------------------------------------------
+# Worker side (runs in the pooled interpreter)
+# ----------------------------------------------------------------------
+
+def _run_child(path: str, cwd: str, out_fd: int, err_fd: int):
+    """Forked child: behave like `python path` with output redirected; never returns"""
+    import runpy
+    import traceback
+    code = 0
+    try:
+        # fd 0 is the worker's job pipe; the script gets EOF on stdin like a plain run
+        null_fd = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(null_fd, 0)
+        os.close(null_fd)
+        sys.stdin = open(0, closefd=False)  # Drop any job bytes buffered in the old reader
+        os.dup2(out_fd, 1)
+        os.dup2(err_fd, 2)
+        os.chdir(cwd)
+        sys.argv = [path]
+        sys.path[0] = os.path.dirname(os.path.abspath(path))
+        runpy.run_path(path, run_name="__main__")
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            code = e.code
+        elif e.code is not None:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException as e:
+        # Report from the script's own frames, as `python path` would
+        tb = e.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename != path:
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb or e.__traceback__)
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def _wait_child(pid: int, timeout: float) -> Optional[int]:
+    """Exit code of pid, or None if it was killed for exceeding timeout"""
+    deadline = time.monotonic() + timeout
+    delay = 0.001
+    while True:
+        done, status = os.waitpid(pid, os.WNOHANG)
+        if done:
+            return os.waitstatus_to_exitcode(status)
+        if time.monotonic() >= deadline:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            return None
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
+
+
+def _read_capped(f) -> str:
+    f.seek(0)
+    return f.read(OUTPUT_CAP).decode("utf-8", errors="replace")
+
+
+def _worker_main():
+    import tempfile
+    import importlib
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+    protocol = sys.stdout
+    for line in sys.stdin:
+        job = json.loads(line)
+        with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+            protocol.flush()
+            pid = os.fork()
+            if pid == 0:
+                _run_child(job["path"], job["cwd"], out.fileno(), err.fileno())
+            returncode = _wait_child(pid, job["timeout"])
+            reply = {
+                "returncode": returncode,
+                "timed_out": returncode is None,
+                "stdout": _read_capped(out),
+                "stderr": _read_capped(err),
+            }
+        protocol.write(json.dumps(reply) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    _worker_main()
@@ -0,0 +1,137 @@
+"""
+Semantic Decision Cache
+Memoizes short, enumerated LLM decisions (SKIP/REASSIGN/SPLIT, approve/reject)
+so near-duplicate prompts are answered from memory instead of a new LLM call.
+Uses sentence-transformers embeddings when installed, otherwise a bag-of-words
+vector with numbers masked out (task ids, round counts).
+"""
+
+import os
+import re
+import json
+import math
+import logging
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'memory', 'decision_cache.json')
+SIMILARITY_THRESHOLD = 0.92
+MAX_ENTRIES = 512
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+_TOKEN_RE = re.compile(r"[a-z_]+|\d+")
+
+
+def escalation_key(title: str, agent: str, error: str) -> Tuple[str, str]:
+    """
+    (namespace, prompt) for caching a failed-task decision.
+    Only the parts that vary are embedded, so the fixed OPTIONS template cannot
+    make unrelated tasks look alike. Tracebacks are reduced to their final line
+    so they do not outweigh the title. The namespace is per agent.
+    """
+    lines = [line.strip() for line in error.strip().splitlines() if line.strip()]
+    error_line = lines[-1][:200] if lines else ""
+    return f"escalation:{agent}", f"{title}\n{error_line}"
+
+
+class SemanticCache:
+    """Top-1 cosine lookup over cached (prompt, decision) pairs, per namespace"""
+
+    def __init__(self, cache_path: str = CACHE_PATH, threshold: float = SIMILARITY_THRESHOLD,
+                 max_entries: int = MAX_ENTRIES):
+        self.cache_path = os.path.abspath(cache_path)
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self._model = None
+        # namespace -> list of (prompt, vector, decision), oldest first
+        self._entries: Dict[str, List[Tuple[str, object, str]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _embed(self, text: str):
+        if SentenceTransformer is not None:
+            if self._model is None:
+                self._model = SentenceTransformer(EMBEDDING_MODEL)
+            return [float(x) for x in self._model.encode(text, normalize_embeddings=True)]
+        counts = Counter("#" if tok.isdigit() else tok for tok in _TOKEN_RE.findall(text.lower()))
+        norm = math.sqrt(sum(c * c for c in counts.values())) or 1.0
+        return {tok: c / norm for tok, c in counts.items()}
+
+    @staticmethod
+    def _similarity(a, b) -> float:
+        if isinstance(a, dict):
+            if len(a) > len(b):
+                a, b = b, a
+            return sum(v * b.get(k, 0.0) for k, v in a.items())
+        return sum(x * y for x, y in zip(a, b))
+
+    def lookup(self, namespace: str, prompt: str) -> Optional[str]:
+        """Return the cached decision for a near-duplicate prompt, or None"""
+        entries = self._entries.get(namespace)
+        if not entries:
+            self.misses += 1
+            return None
+        vector = self._embed(prompt)
+        best_score, best_decision = 0.0, None
+        for _, cached_vector, decision in entries:
+            score = self._similarity(vector, cached_vector)
+            if score > best_score:
+                best_score, best_decision = score, decision
+        if best_score >= self.threshold:
+            self.hits += 1
+            logger.info(f"Decision cache hit [{namespace}] ({best_score:.2f}): {best_decision}")
+            return best_decision
+        self.misses += 1
+        return None
+
+    def store(self, namespace: str, prompt: str, decision: str):
+        """Remember a decision; the oldest entry in the namespace is evicted past max_entries"""
+        with self.lock:
+            entries = self._entries.setdefault(namespace, [])
+            entries.append((prompt, self._embed(prompt), decision))
+            del entries[:-self.max_entries]
+            self._save()
+
+    def get_stats(self) -> Dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": sum(len(e) for e in self._entries.values()),
+        }
+
+    def _load(self):
+        """Rebuild the in-memory index from the JSON sidecar (vectors are re-derived)"""
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for namespace, pairs in data.items():
+                self._entries[namespace] = [
+                    (prompt, self._embed(prompt), decision)
+                    for prompt, decision in pairs[-self.max_entries:]
+                ]
+        except Exception as e:
+            logger.warning(f"Could not load decision cache: {e}")
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            data = {
+                namespace: [[prompt, decision] for prompt, _, decision in entries]
+                for namespace, entries in self._entries.items()
+            }
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        except Exception as e:
+            logger.warning(f"Could not save decision cache: {e}")
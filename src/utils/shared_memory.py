@@ -13,6 +13,9 @@ import threading
 
 logger = logging.getLogger(__name__)
 
+# Oldest insights are evicted once the store exceeds this many keys
+MAX_INSIGHTS = 512
+
 
 class SharedMemory:
     """Thread-safe shared memory for cross-agent knowledge sharing"""
@@ -20,33 +23,58 @@ class SharedMemory:
     def __init__(self, memory_file: str = "shared_memory.json"):
         self.memory_file = memory_file
         self.lock = threading.Lock()
+        # (stamp, store): local copy valid while the file's (mtime_ns, size) stamp is unchanged;
+        # any writer (this or another instance) changes the stamp, which invalidates it.
+        # Readers share the cached dict without the lock, so writers never mutate it in place:
+        # they build a new store and swap the tuple.
+        self._cache: Optional[tuple] = None
+        self._contexts: Dict[str, tuple] = {}  # agent -> (stamp, prompt context)
         self._ensure_file()
     
     def _ensure_file(self):
         if not os.path.exists(self.memory_file):
             self._save({"insights": {}, "patterns": [], "strategies": {}, "warnings": []})
     
-    def _load(self) -> Dict:
+    def _file_stamp(self):
+        st = os.stat(self.memory_file)
+        return (st.st_mtime_ns, st.st_size)
+    
+    def _load_stamped(self) -> tuple:
+        """(stamp, store); re-read and re-parsed only when the file stamp has changed"""
         try:
-            with open(self.memory_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            stamp = self._file_stamp()
+            cache = self._cache
+            if cache is None or stamp != cache[0]:
+                with open(self.memory_file, 'r', encoding='utf-8') as f:
+                    cache = (stamp, json.load(f))
+                self._cache = cache
+            return cache
         except:
-            return {"insights": {}, "patterns": [], "strategies": {}, "warnings": []}
+            return None, {"insights": {}, "patterns": [], "strategies": {}, "warnings": []}
+    
+    def _load(self) -> Dict:
+        """Cached store; treat as read-only"""
+        return self._load_stamped()[1]
     
     def _save(self, data: Dict):
         with open(self.memory_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+        self._cache = (self._file_stamp(), data)
     
     def share_insight(self, agent_name: str, key: str, value: str):
         """Agent shares a discovery/insight that other agents can use"""
         with self.lock:
             data = self._load()
-            data["insights"][key] = {
+            insights = dict(data["insights"])
+            insights.pop(key, None)  # re-insert so the key becomes most recent
+            insights[key] = {
                 "value": value,
                 "author": agent_name,
                 "timestamp": datetime.now().isoformat()
             }
-            self._save(data)
+            for stale in list(insights)[:max(0, len(insights) - MAX_INSIGHTS)]:
+                del insights[stale]
+            self._save({**data, "insights": insights})
             logger.info(f"📡 {agent_name} shared insight: {key}")
     
     def get_insight(self, key: str) -> Optional[str]:
@@ -57,21 +85,20 @@ class SharedMemory:
     
     def get_all_insights(self) -> Dict:
         """Get all shared insights"""
-        return self._load().get("insights", {})
+        return dict(self._load().get("insights", {}))
     
     def share_pattern(self, agent_name: str, pattern: str, confidence: float = 0.5):
         """Share a discovered market pattern"""
         with self.lock:
             data = self._load()
-            data["patterns"].append({
+            patterns = data["patterns"] + [{
                 "pattern": pattern,
                 "confidence": confidence,
                 "author": agent_name,
                 "timestamp": datetime.now().isoformat()
-            })
+            }]
             # Keep last 50 patterns
-            data["patterns"] = data["patterns"][-50:]
-            self._save(data)
+            self._save({**data, "patterns": patterns[-50:]})
     
     def get_patterns(self, min_confidence: float = 0.0) -> List[Dict]:
         """Get patterns above confidence threshold"""
@@ -82,11 +109,11 @@ class SharedMemory:
         """Share strategy performance results"""
         with self.lock:
             data = self._load()
-            data["strategies"][strategy_name] = {
+            strategies = {**data["strategies"], strategy_name: {
                 **metrics,
                 "timestamp": datetime.now().isoformat()
-            }
-            self._save(data)
+            }}
+            self._save({**data, "strategies": strategies})
     
     def get_best_strategy(self) -> Optional[Dict]:
         """Get the best performing strategy"""
@@ -100,17 +127,19 @@ class SharedMemory:
         """Add a system-wide warning"""
         with self.lock:
             data = self._load()
-            data["warnings"].append({
+            warnings = data["warnings"] + [{
                 "warning": warning,
                 "author": agent_name,
                 "timestamp": datetime.now().isoformat()
-            })
-            data["warnings"] = data["warnings"][-20:]
-            self._save(data)
+            }]
+            self._save({**data, "warnings": warnings[-20:]})
     
     def get_context_for_agent(self, agent_name: str) -> str:
         """Get a formatted context string for an agent to use in prompts"""
-        data = self._load()
+        stamp, data = self._load_stamped()
+        cached = self._contexts.get(agent_name)
+        if cached is not None and stamp is not None and cached[0] == stamp:
+            return cached[1]
         
         parts = []
         
@@ -145,4 +174,7 @@ class SharedMemory:
             for w in warnings:
                 parts.append(f"⚠️ {w['warning']} (by {w['author']})")
         
-        return "\n".join(parts) if parts else ""
+        context = "\n".join(parts) if parts else ""
+        if stamp is not None:
+            self._contexts[agent_name] = (stamp, context)
+        return context
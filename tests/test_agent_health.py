@@ -0,0 +1,33 @@
+import threading
+
+from src.utils.agent_health import AgentHealthMonitor
+
+
+def test_concurrent_first_task_started_registers_once():
+    for _ in range(50):
+        monitor = AgentHealthMonitor()
+        barrier = threading.Barrier(8)
+
+        def start_and_finish():
+            barrier.wait()
+            monitor.task_started("engineer", "task")
+            monitor.task_completed("engineer", success=True, tokens_used=10)
+
+        threads = [threading.Thread(target=start_and_finish) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        status = monitor.get_status_all()["engineer"]
+        assert status["tasks_done"] == 8
+        assert status["tokens"] == 80
+
+
+def test_register_without_reset_keeps_metrics():
+    monitor = AgentHealthMonitor()
+    monitor.task_started("engineer", "task")
+    monitor.task_completed("engineer", success=False)
+    monitor.register_agent("engineer", reset=False)
+    assert monitor.get_status_all()["engineer"]["tasks_failed"] == 1
+    monitor.register_agent("engineer")
+    assert monitor.get_status_all()["engineer"]["tasks_failed"] == 0
@@ -0,0 +1,42 @@
+import json
+import threading
+
+from src.utils import auto_recovery
+from src.utils.auto_recovery import AutoRecovery
+
+
+def test_flush_writes_latest_state_while_mutators_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(auto_recovery, "orjson", None)  # pure-Python encoder path
+    monkeypatch.setattr(auto_recovery, "SAVE_DEBOUNCE_SEC", 0)
+    checkpoint = tmp_path / "checkpoint.json"
+    recovery = AutoRecovery(str(checkpoint))
+
+    def mutate():
+        for i in range(500):
+            recovery.task_completed(i, f"task {i}")
+            recovery.save_agent_state(f"agent{i % 7}", {"round": i})
+
+    threads = [threading.Thread(target=mutate) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for _ in range(200):
+        recovery.flush()
+    for t in threads:
+        t.join()
+    recovery.flush()
+
+    saved = json.loads(checkpoint.read_text())
+    assert len(saved["completed_tasks"]) == 1000
+    assert saved["agent_states"]["agent0"]["round"] >= 497
+
+
+def test_failed_write_stays_pending(tmp_path, monkeypatch):
+    checkpoint = tmp_path / "checkpoint.json"
+    recovery = AutoRecovery(str(checkpoint))
+    recovery.set_phase("voting")
+    monkeypatch.setattr(recovery, "checkpoint_file", str(tmp_path / "missing" / "checkpoint.json"))
+    recovery.flush()
+    assert recovery._dirty.is_set()
+    monkeypatch.setattr(recovery, "checkpoint_file", str(checkpoint))
+    recovery.flush()
+    assert json.loads(checkpoint.read_text())["phase"] == "voting"
@@ -0,0 +1,10 @@
+import asyncio
+
+from src.agents.engineer import Engineer
+
+
+def test_receive_message_keeps_conversation_history():
+    agent = Engineer({})
+    asyncio.run(agent.receive_message("project_manager", "first"))
+    asyncio.run(agent.receive_message("project_manager", "second"))
+    assert list(agent.conversation_history) == ["project_manager: first", "project_manager: second"]
@@ -0,0 +1,53 @@
+import pytest
+
+from src.utils.kelly import kelly_binary, parse_kelly_inputs, position_size
+
+
+def test_kelly_binary_closed_form():
+    # k = p/a - (1-p)/b
+    assert kelly_binary(0.5, 0.02, 0.04) == pytest.approx(12.5)
+    assert kelly_binary(0.6, 1.0, 1.0) == pytest.approx(0.2)
+    assert kelly_binary(0.4, 1.0, 1.0) == pytest.approx(-0.2)
+
+
+def test_parse_percentages():
+    values = parse_kelly_inputs("Size a trade: capital $10,000, win rate 55%, avg win 4%, avg loss 2%")
+    assert values == pytest.approx({"capital": 10000.0, "p": 0.55, "b": 0.04, "a": 0.02})
+
+
+def test_parse_bare_fractions():
+    values = parse_kelly_inputs("p=0.6 a=0.01 b=0.02 capital: 5000")
+    assert values == pytest.approx({"capital": 5000.0, "p": 0.6, "b": 0.02, "a": 0.01})
+
+
+@pytest.mark.parametrize("text", [
+    "win rate 55%, avg win 2, avg loss 1",       # bare values > 1: units unknown
+    "p=0.55 b=1.5 a=1",
+    "win rate 55, avg win 4%, avg loss 2%",      # bare p > 1
+    "win rate 55%, avg win 4%, avg loss 0.02",   # a and b in different units
+    "win rate 55%, avg win 4%",                  # a missing
+    "Calculate position size for a 10000 account",
+])
+def test_parse_ambiguous_or_incomplete_returns_none(text):
+    assert parse_kelly_inputs(text) is None
+
+
+def test_position_size_caps():
+    sizing = position_size(0.55, 0.02, 0.04, capital=10000.0, max_position_pct=5.0, max_loss_pct=2.0)
+    assert sizing["kelly_fraction"] == pytest.approx(16.25)
+    assert sizing["fraction"] == pytest.approx(0.05)
+    assert sizing["position"] == pytest.approx(500.0)
+    assert sizing["max_loss"] == pytest.approx(10.0)
+
+
+def test_position_size_loss_cap_binds():
+    # Kelly 0.2, position cap 50%, but losing the whole stake may cost at most 2%
+    sizing = position_size(0.6, 1.0, 1.0, capital=1000.0, max_position_pct=50.0, max_loss_pct=2.0)
+    assert sizing["fraction"] == pytest.approx(0.02)
+    assert sizing["max_loss"] == pytest.approx(20.0)
+
+
+def test_position_size_negative_edge_is_zero():
+    sizing = position_size(0.4, 1.0, 1.0)
+    assert sizing["fraction"] == 0.0
+    assert "position" not in sizing
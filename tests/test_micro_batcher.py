@@ -0,0 +1,44 @@
+import asyncio
+import json
+
+from src.utils.llm_client import BATCH_INSTRUCTIONS, BATCH_ITEM_TOKENS, BATCH_MAX_TOKENS, MicroBatcher
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    async def chat_completion_async(self, messages, temperature=0.7, model_override=None, cache=True,
+                                    max_tokens=4000):
+        self.calls.append(max_tokens)
+        if BATCH_INSTRUCTIONS not in messages[0]["content"]:
+            return "single"
+        packed = json.loads(messages[1]["content"])
+        return json.dumps([{"id": p["id"], "response": p["prompt"].upper()} for p in packed])
+
+
+def ask(batcher, prompt):
+    return batcher.submit([{"role": "system", "content": "sys"}, {"role": "user", "content": prompt}])
+
+
+def test_packed_call_budget_scales_with_group_size():
+    client = FakeClient()
+    batcher = MicroBatcher(client)
+
+    async def run():
+        return await asyncio.gather(*(ask(batcher, f"q{i}") for i in range(3)))
+
+    assert asyncio.run(run()) == ["Q0", "Q1", "Q2"]
+    assert client.calls == [3 * BATCH_ITEM_TOKENS]
+
+
+def test_group_size_bounded_by_output_budget():
+    client = FakeClient()
+    batcher = MicroBatcher(client, max_batch=64)
+    assert batcher.max_batch * BATCH_ITEM_TOKENS <= BATCH_MAX_TOKENS
+
+    async def run():
+        return await asyncio.gather(*(ask(batcher, f"q{i}") for i in range(40)))
+
+    assert asyncio.run(run()) == [f"Q{i}" for i in range(40)]
+    assert all(tokens <= BATCH_MAX_TOKENS for tokens in client.calls)
@@ -0,0 +1,16 @@
+import asyncio
+
+from src.utils.script_runner import ScriptRunnerPool
+
+
+def test_script_reading_stdin_gets_eof(tmp_path):
+    script = tmp_path / "read_stdin.py"
+    script.write_text("import sys\nprint(repr(sys.stdin.readline()))\n")
+
+    async def run_twice():
+        pool = ScriptRunnerPool(size=1)
+        return [await pool.run(str(script), str(tmp_path), timeout=5) for _ in range(2)]
+
+    for returncode, stdout, _ in asyncio.run(run_twice()):
+        assert returncode == 0
+        assert stdout.strip() == "''"
@@ -0,0 +1,32 @@
+from src.utils.semantic_cache import SemanticCache, escalation_key
+
+TRACEBACK = (
+    "Traceback (most recent call last):\n"
+    '  File "workspace/strategy.py", line 12, in <module>\n'
+    "    import talib\n"
+    "ModuleNotFoundError: No module named 'talib'"
+)
+
+
+def test_escalation_key_drops_template_and_task_id():
+    namespace, key = escalation_key("Build RSI strategy backtest", "quant_analyst", TRACEBACK)
+    assert namespace == "escalation:quant_analyst"
+    assert key == "Build RSI strategy backtest\nModuleNotFoundError: No module named 'talib'"
+
+
+def test_different_tasks_with_same_error_do_not_collide(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.utils.semantic_cache.SentenceTransformer", None)
+    cache = SemanticCache(cache_path=str(tmp_path / "decision_cache.json"))
+    for error in ("Unknown error", TRACEBACK):
+        cache.store(*escalation_key("Build RSI strategy backtest", "quant_analyst", error), "SKIP")
+        # Another agent, same task and error
+        assert cache.lookup(*escalation_key("Build RSI strategy backtest", "data_scientist", error)) is None
+        # Same agent, different task
+        assert cache.lookup(*escalation_key("Download BTC hourly data", "quant_analyst", error)) is None
+
+
+def test_same_failure_reuses_decision(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.utils.semantic_cache.SentenceTransformer", None)
+    cache = SemanticCache(cache_path=str(tmp_path / "decision_cache.json"))
+    cache.store(*escalation_key("Build RSI strategy backtest", "quant_analyst", TRACEBACK), "SPLIT")
+    assert cache.lookup(*escalation_key("Build RSI strategy backtest", "quant_analyst", TRACEBACK)) == "SPLIT"
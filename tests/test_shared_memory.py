@@ -0,0 +1,44 @@
+import threading
+
+from src.utils.shared_memory import SharedMemory
+
+
+def test_writes_do_not_mutate_a_store_readers_hold(tmp_path):
+    memory = SharedMemory(str(tmp_path / "shared_memory.json"))
+    memory.share_insight("engineer", "a", "1")
+    snapshot = memory._load()
+    memory.share_insight("engineer", "b", "2")
+    memory.share_pattern("engineer", "p")
+    memory.share_strategy_result("sma", {"sharpe_ratio": 1.0})
+    memory.add_warning("engineer", "w")
+    assert list(snapshot["insights"]) == ["a"]
+    assert snapshot["patterns"] == [] and snapshot["strategies"] == {} and snapshot["warnings"] == []
+    assert list(memory.get_all_insights()) == ["a", "b"]
+
+
+def test_context_reads_race_with_writers(tmp_path):
+    memory = SharedMemory(str(tmp_path / "shared_memory.json"))
+    errors = []
+    done = threading.Event()
+
+    def writer():
+        try:
+            for i in range(300):
+                memory.share_insight("engineer", f"key{i % 40}", f"value {i}")
+        finally:
+            done.set()
+
+    def reader():
+        try:
+            while not done.is_set():
+                memory.get_context_for_agent("data_scientist")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert "value 299" in memory.get_context_for_agent("data_scientist")